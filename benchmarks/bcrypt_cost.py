@@ -0,0 +1,52 @@
+"""
+Таблица стоимости bcrypt по cost: регистрация (hash), обычный логин (verify)
+и первый логин после смены cost (verify + перехеширование).
+
+    python -m benchmarks.bcrypt_cost --costs 10 11 12 13 --samples 20
+"""
+import argparse
+
+from benchmarks.common import Timer, percentile
+from core.security import hash_password, password_needs_rehash, verify_password
+
+PASSWORD = "correct horse battery staple"
+
+
+def measure(func, samples: int) -> list[float]:
+    latencies = []
+    for _ in range(samples):
+        with Timer() as t:
+            func()
+        latencies.append(t.elapsed)
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--costs", type=int, nargs="+", default=[10, 11, 12, 13])
+    parser.add_argument("--samples", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'cost':>4} {'hash p50':>10} {'login p50':>10} {'login p95':>10} {'rehash login p50':>17}")
+    for cost in args.costs:
+        hashed = hash_password(PASSWORD, rounds=cost)
+        stale = hash_password(PASSWORD, rounds=cost - 1)
+
+        def rehash_login() -> None:
+            verify_password(PASSWORD, stale)
+            if password_needs_rehash(stale, rounds=cost):
+                hash_password(PASSWORD, rounds=cost)
+
+        hashing = measure(lambda: hash_password(PASSWORD, rounds=cost), args.samples)
+        login = measure(lambda: verify_password(PASSWORD, hashed), args.samples)
+        rehash = measure(rehash_login, args.samples)
+        print(
+            f"{cost:>4} {percentile(hashing, 50) * 1000:>8.1f}ms "
+            f"{percentile(login, 50) * 1000:>8.1f}ms "
+            f"{percentile(login, 95) * 1000:>8.1f}ms "
+            f"{percentile(rehash, 50) * 1000:>15.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
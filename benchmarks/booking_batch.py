@@ -0,0 +1,69 @@
+"""
+Сравнение заказа из 4 мест: четыре отдельных add_booking (как POST /bookings/)
+против одного add_bookings (POST /bookings/batch).
+
+    BENCH_DSN=postgresql://... python -m benchmarks.booking_batch --orders 500
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import Timer, connect, create_fixture, create_user, drop_fixture, report
+
+SEATS_PER_ORDER = 4
+
+
+async def single_seat_order(pool, user_id: int, session_id: int, seats: list[int]) -> None:
+    async with pool.acquire() as conn:
+        for seat in seats:
+            async with conn.transaction():
+                await conn.fetch("SELECT * FROM add_booking($1, $2, $3)", user_id, session_id, seat)
+
+
+async def batch_order(pool, user_id: int, session_id: int, seats: list[int]) -> None:
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            await conn.fetch("SELECT * FROM add_bookings($1, $2, $3)", user_id, session_id, seats)
+
+
+async def run(name: str, order, pool, orders: int, concurrency: int) -> None:
+    async with pool.acquire() as conn:
+        fixture = await create_fixture(conn, sessions=1, capacity=orders * SEATS_PER_ORDER)
+        users = [await create_user(conn, fixture) for _ in range(orders)]
+
+    session_id = fixture["session_ids"][0]
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one(i: int) -> None:
+        seats = list(range(i * SEATS_PER_ORDER + 1, (i + 1) * SEATS_PER_ORDER + 1))
+        async with semaphore:
+            start = time.perf_counter()
+            await order(pool, users[i], session_id, seats)
+            latencies.append(time.perf_counter() - start)
+
+    try:
+        with Timer() as timer:
+            await asyncio.gather(*(one(i) for i in range(orders)))
+        report(name, latencies, timer.elapsed, orders, seats=orders * SEATS_PER_ORDER)
+    finally:
+        async with pool.acquire() as conn:
+            await drop_fixture(conn, fixture)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    pool = await connect()
+    try:
+        await run("4 x add_booking", single_seat_order, pool, args.orders, args.concurrency)
+        await run("1 x add_bookings", batch_order, pool, args.orders, args.concurrency)
+    finally:
+        await pool.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,89 @@
+"""
+Конкурентные POST /bookings/ на один "горячий" сеанс: прямой путь (транзакция на
+запрос, все ждут блокировку строки sessions) против очереди сеанса с групповой
+фиксацией (services.booking_queue.BookingQueue + add_bookings_group).
+
+    BENCH_DSN=postgresql://... python -m benchmarks.booking_contention --requests 2000
+"""
+import argparse
+import asyncio
+import time
+
+import asyncpg
+
+from benchmarks.common import Timer, connect, create_fixture, create_user, drop_fixture, report
+from domain.exceptions import DomainError
+from schemas.bookings import NewBooking
+from services.booking_queue import BookingQueue
+
+
+async def prepare(pool, requests: int, seats: int) -> tuple[dict, list[int]]:
+    async with pool.acquire() as conn:
+        fixture = await create_fixture(conn, sessions=1, capacity=seats)
+        users = [await create_user(conn, fixture) for _ in range(requests)]
+    return fixture, users
+
+
+async def run(name: str, book, pool, requests: int, seats: int) -> None:
+    fixture, users = await prepare(pool, requests, seats)
+    session_id = fixture["session_ids"][0]
+    latencies: list[float] = []
+    conflicts = 0
+
+    async def one(i: int) -> None:
+        nonlocal conflicts
+        start = time.perf_counter()
+        try:
+            await book(users[i], NewBooking(session_id=session_id, seat_number=i % seats + 1))
+        except (DomainError, asyncpg.RaiseError, asyncpg.UniqueViolationError):
+            conflicts += 1
+        latencies.append(time.perf_counter() - start)
+
+    try:
+        with Timer() as timer:
+            await asyncio.gather(*(one(i) for i in range(requests)))
+        report(name, latencies, timer.elapsed, requests, conflicts=conflicts)
+    finally:
+        async with pool.acquire() as conn:
+            await drop_fixture(conn, fixture)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--seats", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=64)
+    args = parser.parse_args()
+
+    pool = await connect()
+
+    async def direct(user_id: int, data: NewBooking):
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                return await conn.fetch(
+                    "SELECT * FROM add_booking($1, $2, $3)",
+                    user_id, data.session_id, data.seat_number,
+                )
+
+    async def apply(session_id: int, requests: list[tuple[int, NewBooking]]):
+        async with pool.acquire() as conn:
+            rows = await conn.fetch(
+                "SELECT * FROM add_bookings_group($1, $2, $3)",
+                session_id,
+                [user_id for user_id, _ in requests],
+                [data.seat_number for _, data in requests],
+            )
+        return [DomainError(r["error"]) if r["error"] else r["booking_id"] for r in rows]
+
+    queue = BookingQueue(apply, batch_size=args.batch_size, idle_seconds=1.0)
+
+    try:
+        await run("direct add_booking", direct, pool, args.requests, args.seats)
+        await run("per-session queue", queue.submit, pool, args.requests, args.seats)
+    finally:
+        await queue.close()
+        await pool.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
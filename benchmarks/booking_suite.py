@@ -0,0 +1,171 @@
+"""
+Нагрузочный прогон пути бронирования: N пользователей одновременно борются за M мест
+в каждом из K сеансов через BookingRepository (тот же код, что вызывает
+routers/bookings.py) и функции add_booking / add_bookings / cancel_booking.
+
+Печатает пропускную способность, p50/p95/p99, долю конфликтов и проверяет инварианты:
+  * ни одно место не забронировано дважды;
+  * sessions.available_seats = total_seats - число активных бронирований;
+  * users.active_bookings совпадает с числом активных бронирований и не больше 5.
+При нарушении инвариантов завершается с кодом 1, поэтому годится для прогона перед
+каждым изменением схемы:
+
+    BENCH_DSN=postgresql://... python -m benchmarks.booking_suite --users 200 --seats 100 --sessions 4
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from benchmarks.common import BENCH_DSN, Timer, connect, create_fixture, create_user, drop_fixture, percentile, report
+from domain.exceptions import DomainError
+from repositories.booking_repository import BookingRepository
+from schemas.bookings import NewBooking, NewBookingBatch
+
+CONFLICT_MARKERS = ("already booked", "not available", "held by another user", "booked concurrently")
+
+
+async def check_invariants(pool, session_ids: list[int], user_ids: list[int]) -> dict[str, list]:
+    async with pool.acquire() as conn:
+        double_booked = await conn.fetch(
+            """
+            SELECT session_id, seat_number, COUNT(*) AS bookings
+            FROM bookings
+            WHERE session_id = ANY($1) AND status = 'active'
+            GROUP BY session_id, seat_number
+            HAVING COUNT(*) > 1
+            """,
+            session_ids,
+        )
+        seat_drift = await conn.fetch(
+            """
+            SELECT s.id, s.available_seats, s.total_seats - COUNT(b.id) AS expected
+            FROM sessions s
+            LEFT JOIN bookings b ON b.session_id = s.id AND b.status = 'active'
+            WHERE s.id = ANY($1)
+            GROUP BY s.id
+            HAVING s.available_seats <> s.total_seats - COUNT(b.id)
+            """,
+            session_ids,
+        )
+        user_drift = await conn.fetch(
+            """
+            SELECT u.id, u.active_bookings, COUNT(b.id) AS expected
+            FROM users u
+            LEFT JOIN bookings b ON b.user_id = u.id AND b.status = 'active'
+            WHERE u.id = ANY($1)
+            GROUP BY u.id
+            HAVING u.active_bookings <> COUNT(b.id) OR COUNT(b.id) > 5
+            """,
+            user_ids,
+        )
+    return {
+        "double_booked_seats": [dict(r) for r in double_booked],
+        "available_seats_drift": [dict(r) for r in seat_drift],
+        "user_counter_drift": [dict(r) for r in user_drift],
+    }
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--seats", type=int, default=100, help="seats per session")
+    parser.add_argument("--sessions", type=int, default=4)
+    parser.add_argument("--attempts", type=int, default=20, help="booking attempts per user")
+    parser.add_argument("--batch-ratio", type=float, default=0.2, help="share of attempts sent as 2-4 seat batches")
+    parser.add_argument("--cancel-ratio", type=float, default=0.3, help="chance to cancel after a successful booking")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", dest="json_path", help="write the summary to this file")
+    args = parser.parse_args()
+
+    pool = await connect()
+    engine = create_async_engine(BENCH_DSN.replace("postgresql://", "postgresql+asyncpg://", 1), pool_size=20)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+    async with pool.acquire() as conn:
+        fixture = await create_fixture(conn, sessions=args.sessions, capacity=args.seats)
+        users = [await create_user(conn, fixture) for _ in range(args.users)]
+
+    latencies: dict[str, list[float]] = {"book": [], "batch": [], "cancel": []}
+    outcomes = {"ok": 0, "conflict": 0, "rejected": 0}
+
+    async def user_loop(user_id: int, rng: random.Random) -> None:
+        for _ in range(args.attempts):
+            session_id = rng.choice(fixture["session_ids"])
+            batch = rng.random() < args.batch_ratio
+            start = time.perf_counter()
+            try:
+                async with session_factory() as session:
+                    repo = BookingRepository(session)
+                    if batch:
+                        seats = rng.sample(range(1, args.seats + 1), rng.randint(2, 4))
+                        bookings = await repo.create_many(
+                            user_id, NewBookingBatch(session_id=session_id, seat_numbers=seats)
+                        )
+                    else:
+                        seat = rng.randint(1, args.seats)
+                        bookings = [await repo.create(user_id, NewBooking(session_id=session_id, seat_number=seat))]
+                outcomes["ok"] += 1
+            except DomainError as e:
+                kind = "conflict" if any(m in str(e) for m in CONFLICT_MARKERS) else "rejected"
+                outcomes[kind] += 1
+                bookings = []
+            latencies["batch" if batch else "book"].append(time.perf_counter() - start)
+
+            for booking in bookings:
+                if rng.random() < args.cancel_ratio:
+                    start = time.perf_counter()
+                    async with session_factory() as session:
+                        await BookingRepository(session).cancel(booking.id, user_id)
+                    latencies["cancel"].append(time.perf_counter() - start)
+
+    try:
+        with Timer() as timer:
+            await asyncio.gather(
+                *(user_loop(user_id, random.Random(args.seed + i)) for i, user_id in enumerate(users))
+            )
+
+        attempts = args.users * args.attempts
+        all_latencies = latencies["book"] + latencies["batch"]
+        report("book (single seat)", latencies["book"], timer.elapsed, len(latencies["book"]))
+        report("book (batch)", latencies["batch"], timer.elapsed, len(latencies["batch"]))
+        report("cancel", latencies["cancel"], timer.elapsed, len(latencies["cancel"]))
+        report(
+            "all attempts", all_latencies, timer.elapsed, attempts,
+            conflict_rate=f"{outcomes['conflict'] / attempts:.1%}",
+            rejected=outcomes["rejected"],
+        )
+
+        violations = await check_invariants(pool, fixture["session_ids"], users)
+        ok = not any(violations.values())
+        print("invariants:", "OK" if ok else json.dumps(violations, default=str))
+
+        if args.json_path:
+            summary = {
+                "args": vars(args),
+                "elapsed": timer.elapsed,
+                "throughput": attempts / timer.elapsed,
+                "p50_ms": percentile(all_latencies, 50) * 1000,
+                "p95_ms": percentile(all_latencies, 95) * 1000,
+                "p99_ms": percentile(all_latencies, 99) * 1000,
+                "outcomes": outcomes,
+                "invariants_ok": ok,
+                "violations": violations,
+            }
+            with open(args.json_path, "w", encoding="utf-8") as f:
+                json.dump(summary, f, indent=2, default=str)
+
+        return 0 if ok else 1
+    finally:
+        async with pool.acquire() as conn:
+            await drop_fixture(conn, fixture)
+        await pool.close()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
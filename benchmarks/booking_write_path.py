@@ -0,0 +1,70 @@
+"""
+Стоимость одной записи в пути бронирования: add_booking и cancel_booking без
+конкуренции за один сеанс (каждый воркер работает со своим сеансом).
+
+Запускается до и после изменения схемы на одной и той же базе:
+
+    git checkout <before> && python main.py   # применить старую схему
+    BENCH_DSN=postgresql://... python -m benchmarks.booking_write_path
+    git checkout <after>  && python main.py
+    BENCH_DSN=postgresql://... python -m benchmarks.booking_write_path
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import Timer, connect, create_fixture, create_user, drop_fixture, report
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--cycles", type=int, default=500, help="book+cancel cycles per worker")
+    parser.add_argument("--preload", type=int, default=200, help="canceled bookings per session before the run")
+    args = parser.parse_args()
+
+    pool = await connect()
+    async with pool.acquire() as conn:
+        fixture = await create_fixture(conn, sessions=args.workers, capacity=args.preload + 10)
+        users = [await create_user(conn, fixture) for _ in range(args.workers)]
+        # История отменённых бронирований делает COUNT(*) старых триггеров заметным.
+        for session_id, user_id in zip(fixture["session_ids"], users):
+            for seat in range(1, args.preload + 1):
+                booking_id = await conn.fetchval(
+                    "SELECT id FROM add_booking($1, $2, $3)", user_id, session_id, seat
+                )
+                await conn.fetch("SELECT * FROM cancel_booking($1, $2)", booking_id, user_id)
+
+    book_latencies: list[float] = []
+    cancel_latencies: list[float] = []
+
+    async def worker(session_id: int, user_id: int) -> None:
+        async with pool.acquire() as conn:
+            for i in range(args.cycles):
+                seat = i % args.preload + 1
+                start = time.perf_counter()
+                async with conn.transaction():
+                    booking_id = await conn.fetchval(
+                        "SELECT id FROM add_booking($1, $2, $3)", user_id, session_id, seat
+                    )
+                book_latencies.append(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                async with conn.transaction():
+                    await conn.fetch("SELECT * FROM cancel_booking($1, $2)", booking_id, user_id)
+                cancel_latencies.append(time.perf_counter() - start)
+
+    try:
+        with Timer() as timer:
+            await asyncio.gather(*(worker(s, u) for s, u in zip(fixture["session_ids"], users)))
+        operations = args.workers * args.cycles
+        report("add_booking", book_latencies, timer.elapsed, operations)
+        report("cancel_booking", cancel_latencies, timer.elapsed, operations)
+    finally:
+        async with pool.acquire() as conn:
+            await drop_fixture(conn, fixture)
+        await pool.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,86 @@
+"""
+Пропускная способность потокового импорта фильмов (FilmImporter: разбор, NewFilm, COPY, слияние)
+против построчных вызовов add_film, как при тысячах POST /films/.
+
+    BENCH_DSN=postgresql://... python -m benchmarks.film_import --rows 50000
+"""
+import argparse
+import asyncio
+import json
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from benchmarks.common import BENCH_DSN, Timer, connect
+from repositories.film_repository import FilmRepository
+from services.film_import import FilmImporter
+
+CHUNK = 64 * 1024
+
+
+def ndjson(tag: str, rows: int) -> bytes:
+    return "".join(
+        json.dumps(
+            {
+                "title": f"bench-{tag}-{i}",
+                "genre": "Драма",
+                "duration": 90 + i % 60,
+                "rating": (i % 100) / 10,
+                "description": "benchmark fixture",
+            },
+            ensure_ascii=False,
+        ) + "\n"
+        for i in range(rows)
+    ).encode()
+
+
+async def chunks(body: bytes):
+    for i in range(0, len(body), CHUNK):
+        yield body[i:i + CHUNK]
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--single-rows", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    engine = create_async_engine(BENCH_DSN.replace("postgresql://", "postgresql+asyncpg://"))
+    sessions = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    pool = await connect()
+    tag = uuid.uuid4().hex[:8]
+
+    try:
+        body = ndjson(tag, args.rows)
+        async with sessions() as session:
+            importer = FilmImporter(
+                FilmRepository(session), batch_size=args.batch_size, max_errors=100, max_line_bytes=CHUNK
+            )
+            with Timer() as timer:
+                result = await importer.run(chunks(body), "ndjson")
+        print(
+            f"{'streamed COPY import':<28} rows={args.rows:<6} rows/s={args.rows / timer.elapsed:>9.1f} "
+            f"inserted={result.inserted} rejected={result.rejected}"
+        )
+
+        async with pool.acquire() as conn:
+            with Timer() as timer:
+                for i in range(args.single_rows):
+                    await conn.fetch(
+                        "SELECT * FROM add_film($1, $2, $3, $4, $5)",
+                        f"bench-{tag}-single-{i}", "Драма", 90, 5.0, "benchmark fixture",
+                    )
+        print(
+            f"{'add_film per row':<28} rows={args.single_rows:<6} "
+            f"rows/s={args.single_rows / timer.elapsed:>9.1f}"
+        )
+    finally:
+        async with pool.acquire() as conn:
+            await conn.execute("DELETE FROM films WHERE title LIKE $1", f"bench-{tag}-%")
+        await pool.close()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,50 @@
+"""
+Стоимость проверки access-токена на один запрос:
+PEM-текст на каждый вызов (как было), заранее загруженный ключ и кэш проверенных токенов.
+
+    python -m benchmarks.jwt_verify --requests 20000 --tokens 100
+"""
+import argparse
+
+import jwt
+
+from benchmarks.common import Timer, report
+from core.config import settings
+from core.security import VerifiedTokenCache, create_jwt, decode_jwt
+
+
+def run(name: str, verify, tokens: list[str], requests: int) -> None:
+    latencies: list[float] = []
+    with Timer() as total:
+        for i in range(requests):
+            with Timer() as t:
+                verify(tokens[i % len(tokens)])
+            latencies.append(t.elapsed)
+    report(name, latencies, total.elapsed, requests)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--tokens", type=int, default=100, help="число разных клиентов")
+    args = parser.parse_args()
+
+    tokens = [
+        create_jwt("access", str(i), settings.auth_jwt.access_token_expire)
+        for i in range(args.tokens)
+    ]
+    public_pem = settings.auth_jwt.public_key_path.read_text()
+    cache = VerifiedTokenCache(settings.auth_jwt.verified_cache_size)
+
+    run(
+        "pem_per_call",
+        lambda token: jwt.decode(token, public_pem, algorithms=[settings.ALGORITHM]),
+        tokens,
+        args.requests,
+    )
+    run("loaded_key", decode_jwt, tokens, args.requests)
+    run("verified_cache", cache.decode, tokens, args.requests)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Задержка листинга фильмов во время шторма логинов: bcrypt прямо в event loop (как было)
+против PasswordHasher с отдельным пулом и лимитом очереди.
+
+    BENCH_DSN=postgresql://... python -m benchmarks.login_storm --logins 200 --concurrency 50
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import Timer, connect, report
+from core.security import hash_password, verify_password
+from domain.exceptions import PasswordHasherBusyError
+from services.password_hasher import PasswordHasher
+
+PASSWORD = "correct horse battery staple"
+LISTING = "SELECT id, title, genre, duration, rating FROM films ORDER BY rating DESC, id DESC LIMIT 50"
+
+
+async def listing_loop(pool, stop: asyncio.Event, latencies: list[float]) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        async with pool.acquire() as conn:
+            await conn.fetch(LISTING)
+        latencies.append(time.perf_counter() - start)
+
+
+async def run(name: str, verify, pool, logins: int, concurrency: int, hashed: bytes) -> None:
+    stop = asyncio.Event()
+    listing: list[float] = []
+    login: list[float] = []
+    rejected = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        nonlocal rejected
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await verify(PASSWORD, hashed)
+            except PasswordHasherBusyError:
+                rejected += 1
+            login.append(time.perf_counter() - start)
+
+    listener = asyncio.create_task(listing_loop(pool, stop, listing))
+    with Timer() as timer:
+        await asyncio.gather(*(one() for _ in range(logins)))
+    stop.set()
+    await listener
+
+    report(f"{name} listing", listing, timer.elapsed, len(listing))
+    report(f"{name} login", login, timer.elapsed, logins, rejected=rejected)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--max-pending", type=int, default=32)
+    args = parser.parse_args()
+
+    hashed = hash_password(PASSWORD)
+    pool = await connect()
+
+    async def inline(password: str, hashed_password: bytes) -> bool:
+        return verify_password(password, hashed_password)
+
+    async def idle(password: str, hashed_password: bytes) -> bool:
+        await asyncio.sleep(0.05)
+        return True
+
+    hasher = PasswordHasher(workers=args.workers, max_pending=args.max_pending)
+    try:
+        await run("no storm", idle, pool, args.logins, args.concurrency, hashed)
+        await run("inline bcrypt", inline, pool, args.logins, args.concurrency, hashed)
+        await run("executor bcrypt", hasher.verify, pool, args.logins, args.concurrency, hashed)
+    finally:
+        hasher.close()
+        await pool.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,77 @@
+"""
+Задержка вызовов S3: новый клиент aioboto3 на каждый вызов (как было) против
+одного общего клиента с пулом соединений. Нужен локальный S3, например MinIO:
+
+    docker run -p 9000:9000 minio/minio server /data
+    BENCH_S3_URL=http://localhost:9000 python -m benchmarks.s3_client --calls 500 --concurrency 20
+"""
+import argparse
+import asyncio
+import os
+import uuid
+
+from benchmarks.common import Timer, report
+from repositories.s3_repository import S3Repository
+
+BENCH_S3_URL = os.getenv("BENCH_S3_URL", "http://localhost:9000")
+BENCH_S3_KEY = os.getenv("BENCH_S3_KEY", "minioadmin")
+BENCH_S3_SECRET = os.getenv("BENCH_S3_SECRET", "minioadmin")
+BENCH_S3_BUCKET = os.getenv("BENCH_S3_BUCKET", "bench")
+
+
+def make_repo(pool: int) -> S3Repository:
+    return S3Repository(
+        endpoint_url=BENCH_S3_URL,
+        access_key=BENCH_S3_KEY,
+        secret_key=BENCH_S3_SECRET,
+        region="us-east-1",
+        bucket_name=BENCH_S3_BUCKET,
+        max_pool_connections=pool,
+    )
+
+
+async def run(name: str, repo: S3Repository, calls: int, concurrency: int, body: bytes) -> None:
+    tag = uuid.uuid4().hex[:8]
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def call(i: int) -> None:
+        key = f"bench-{tag}-{i}"
+        async with semaphore:
+            with Timer() as t:
+                await repo.upload_file(body, key, "application/octet-stream")
+                await repo.delete(key)
+            latencies.append(t.elapsed)
+
+    with Timer() as total:
+        await asyncio.gather(*(call(i) for i in range(calls)))
+    report(name, latencies, total.elapsed, calls, concurrency=concurrency)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=500, help="пар put_object + delete_object")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--pool", type=int, default=20, help="max_pool_connections общего клиента")
+    parser.add_argument("--size", type=int, default=16 * 1024)
+    args = parser.parse_args()
+
+    body = os.urandom(args.size)
+    repo = make_repo(args.pool)
+    async with repo._new_client() as s3:
+        try:
+            await s3.create_bucket(Bucket=BENCH_S3_BUCKET)
+        except (s3.exceptions.BucketAlreadyOwnedByYou, s3.exceptions.BucketAlreadyExists):
+            pass
+
+    await run("client_per_call", repo, args.calls, args.concurrency, body)
+
+    await repo.start()
+    try:
+        await run("shared_client", repo, args.calls, args.concurrency, body)
+    finally:
+        await repo.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
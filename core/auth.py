@@ -2,29 +2,45 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.security import decode_jwt
+from core.security import verified_tokens
 from schemas.users import User
-from database.db import get_session
+from database.db import get_session, new_session
 from repositories.user_repository import UserRepository
+from services.user_cache import user_cache
 
 
 security = HTTPBearer()
 
 
-async def get_current_user_id(token: str = Depends(security)) -> int:
+async def get_current_claims(token: str = Depends(security)) -> dict:
     try:
-        payload = decode_jwt(token.credentials)
-        return int(payload["sub"])
+        payload = verified_tokens.decode(token.credentials)
+        int(payload["sub"])
     except Exception:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
+    if payload.get("type") != "access":
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
+    return payload
+
+
+async def get_current_user_id(claims: dict = Depends(get_current_claims)) -> int:
+    return int(claims["sub"])
+
+
+async def load_user(user_id: int, session: AsyncSession) -> User | None:
+    user = user_cache.get(user_id)
+    if user is None:
+        user = await UserRepository(session).get_by_id(user_id)
+        if user is not None:
+            user_cache.put(user)
+    return user
 
 
 async def get_current_user(
     user_id: int = Depends(get_current_user_id),
     session: AsyncSession = Depends(get_session),
 ) -> User:
-    repo = UserRepository(session)
-    user = await repo.get_by_id(user_id)
+    user = await load_user(user_id, session)
 
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
@@ -32,7 +48,21 @@ async def get_current_user(
     return user
 
 
-def admin_required(current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
+async def admin_required(claims: dict = Depends(get_current_claims)) -> int:
+    user_id = int(claims["sub"])
+
+    # Claim role только отсекает заведомо не-админов; права подтверждает строка users
+    # из кэша, который сбрасывается при смене роли во всех воркерах.
+    if claims.get("role") not in (None, "admin"):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admins only")
+
+    user = user_cache.get(user_id)
+    if user is None:
+        async with new_session() as session:
+            user = await load_user(user_id, session)
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    if user.role != "admin":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admins only")
-    return current_user
+    return user_id
@@ -1,6 +1,6 @@
 from pathlib import Path
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 ROOT = Path(__file__).resolve().parents[1]
@@ -11,6 +11,7 @@ class AuthJWT(BaseModel):
     public_key_path: Path = ROOT / "public.pem"
     access_token_expire: int = 300
     refresh_token_expire_days: int = 7
+    verified_cache_size: int = 10_000
 
 
 class S3Settings(BaseModel):
@@ -21,12 +22,91 @@ class S3Settings(BaseModel):
     account_id: str
     bucket_name: str
     region: str = "auto"
+    # S3 требует части multipart не меньше 5 MiB, кроме последней.
+    multipart_threshold_bytes: int = Field(8 * 1024 * 1024, ge=5 * 1024 * 1024)
+    multipart_part_bytes: int = Field(8 * 1024 * 1024, ge=5 * 1024 * 1024)
+    max_pool_connections: int = 20
+
+
+class SeatMapSettings(BaseModel):
+    max_sessions: int = 1024
+    ttl_seconds: float = 5.0
+
+
+class BookingQueueSettings(BaseModel):
+    enabled: bool = False
+    batch_size: int = 64
+    idle_seconds: float = 30.0
+    max_retries: int = 3
+
+
+class IdempotencySettings(BaseModel):
+    max_entries: int = 10_000
+    ttl_seconds: float = 3600.0
+
+
+class UserCacheSettings(BaseModel):
+    max_entries: int = 10_000
+    ttl_seconds: float = 60.0
+
+
+class PasswordHashingSettings(BaseModel):
+    workers: int = 4
+    max_pending: int = 32
+    bcrypt_rounds: int = Field(default=12, ge=4, le=31)
+
+
+class FilmCatalogSettings(BaseModel):
+    max_entries: int = 512
+    ttl_seconds: float = 60.0
+    page_ttl_seconds: float = 5.0
+
+
+class CatalogSettings(BaseModel):
+    reconnect_seconds: float = 5.0
+    etag_volatile_seconds: float = 5.0
+
+
+class S3OutboxSettings(BaseModel):
+    batch_size: int = 50
+    poll_seconds: float = 5.0
+    base_backoff_seconds: float = 2.0
+    max_backoff_seconds: float = 600.0
+    claim_seconds: float = 300.0
+    pin_seconds: float = 900.0
+    pin_wait_seconds: float = 0.2
+
+
+class FilmImportSettings(BaseModel):
+    batch_size: int = 5000
+    max_errors: int = 1000
+    max_line_bytes: int = 64 * 1024
+
+
+class PosterSettings(BaseModel):
+    widths: list[int] = [160, 320, 640]
+    quality: int = 80
+    workers: int = 2
+    max_bytes: int = 20 * 1024 * 1024
+    chunk_bytes: int = 256 * 1024
+    # Ключи постеров выводятся из содержимого, поэтому объект по URL никогда не меняется.
+    cache_control: str = "public, max-age=31536000, immutable"
 
 
 class Settings(BaseSettings):
     ALGORITHM: str
     auth_jwt: AuthJWT = AuthJWT()
     s3: S3Settings
+    seat_map: SeatMapSettings = SeatMapSettings()
+    booking_queue: BookingQueueSettings = BookingQueueSettings()
+    idempotency: IdempotencySettings = IdempotencySettings()
+    user_cache: UserCacheSettings = UserCacheSettings()
+    password_hashing: PasswordHashingSettings = PasswordHashingSettings()
+    film_catalog: FilmCatalogSettings = FilmCatalogSettings()
+    catalog: CatalogSettings = CatalogSettings()
+    s3_outbox: S3OutboxSettings = S3OutboxSettings()
+    film_import: FilmImportSettings = FilmImportSettings()
+    posters: PosterSettings = PosterSettings()
 
     model_config = SettingsConfigDict(
         env_file=str(ROOT / ".env"),
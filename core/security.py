@@ -1,12 +1,24 @@
 import datetime
+import time
+from collections import OrderedDict
+
 import bcrypt
 import jwt
+from jwt.algorithms import get_default_algorithms
 
 from core.config import settings
 
 
-def hash_password(password: str) -> bytes:
-    salt = bcrypt.gensalt()
+def _load_key(path):
+    return get_default_algorithms()[settings.ALGORITHM].prepare_key(path.read_text())
+
+
+PRIVATE_KEY = _load_key(settings.auth_jwt.private_key_path)
+PUBLIC_KEY = _load_key(settings.auth_jwt.public_key_path)
+
+
+def hash_password(password: str, rounds: int = settings.password_hashing.bcrypt_rounds) -> bytes:
+    salt = bcrypt.gensalt(rounds=rounds)
     hashed_password = bcrypt.hashpw(password.encode(), salt)
     return hashed_password
 
@@ -15,18 +27,32 @@ def verify_password(password: str, hashed_password: bytes) -> bool:
     return bcrypt.checkpw(password.encode(), hashed_password)
 
 
+def password_needs_rehash(hashed_password: bytes, rounds: int = settings.password_hashing.bcrypt_rounds) -> bool:
+    # Формат bcrypt: $2b$<cost>$<salt+hash>
+    try:
+        return int(hashed_password.split(b"$")[2]) != rounds
+    except (IndexError, ValueError):
+        return True
+
+
 def create_jwt(
     token_type: str,
     token_data: str,
     expire_minutes: int,
+    role: str | None = None,
+    jti: str | None = None,
 ) -> str:
     jwt_payload = {"type": token_type, "sub": token_data}
+    if role is not None:
+        jwt_payload["role"] = role
+    if jti is not None:
+        jwt_payload["jti"] = jti
     return encode_jwt(payload=jwt_payload, expire_minutes=expire_minutes)
 
 
 def encode_jwt(
     payload: dict,
-    private_key: str = settings.auth_jwt.private_key_path.read_text(),
+    private_key=PRIVATE_KEY,
     algorithm: str = settings.ALGORITHM,
     expire_minutes: int = settings.auth_jwt.access_token_expire,
 ) -> str:
@@ -40,7 +66,41 @@ def encode_jwt(
 
 def decode_jwt(
     token: str,
-    public_key: str = settings.auth_jwt.public_key_path.read_text(),
+    public_key=PUBLIC_KEY,
     algorithm: str = settings.ALGORITHM,
 ) -> dict:
     return jwt.decode(token, public_key, algorithms=[algorithm])
+
+
+class VerifiedTokenCache:
+    """
+    LRU уже проверенных токенов: токен -> claims.
+
+    Запись живёт не дольше exp самого токена, поэтому истёкший токен снова уходит
+    в decode_jwt и получает ExpiredSignatureError. Токены без exp не кэшируются.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, dict] = OrderedDict()
+
+    def decode(self, token: str) -> dict:
+        claims = self._entries.get(token)
+        if claims is not None:
+            if claims["exp"] > time.time():
+                self._entries.move_to_end(token)
+                return claims
+            del self._entries[token]
+
+        claims = decode_jwt(token)
+        if self.max_entries > 0 and isinstance(claims.get("exp"), (int, float)):
+            self._entries[token] = claims
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return claims
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+verified_tokens = VerifiedTokenCache(settings.auth_jwt.verified_cache_size)
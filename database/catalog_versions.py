@@ -0,0 +1,104 @@
+import asyncio
+import time
+from collections import defaultdict
+from typing import Callable
+
+import asyncpg
+
+from core.config import settings
+from database.db import ASYNCPG_DSN
+
+CHANNEL = "catalog_changed"
+
+
+class CatalogVersions:
+    """
+    Версии каталога (films, halls, sessions) и users, общие для всех воркеров.
+
+    Источник — таблица catalog_versions: её увеличивают триггеры на изменение таблиц
+    и рассылают новое значение через NOTIFY catalog_changed. Воркер держит одно
+    соединение LISTEN и по версиям строит ETag без обращения к БД. Репозитории после
+    своего коммита вызывают touch(): до прихода уведомления ETag для этой таблицы не
+    выдаётся. Пока LISTEN недоступен, версии неизвестны и ETag не выдаётся вовсе.
+    """
+
+    def __init__(self, reconnect_seconds: float, volatile_seconds: float):
+        self.reconnect_seconds = reconnect_seconds
+        self.volatile_seconds = volatile_seconds
+        self._versions: dict[str, int] = {}
+        self._dirty: set[str] = set()
+        self._subscribers: dict[str, list[Callable[[], None]]] = defaultdict(list)
+        self._listener: asyncio.Task | None = None
+
+    def subscribe(self, name: str, callback: Callable[[], None]) -> None:
+        self._subscribers[name].append(callback)
+
+    def _changed(self, name: str) -> None:
+        for callback in self._subscribers.get(name, ()):
+            callback()
+
+    def touch(self, name: str) -> None:
+        self._dirty.add(name)
+        self._changed(name)
+
+    def etag(self, names: tuple[str, ...], volatile: bool = False) -> str | None:
+        parts = []
+        for name in names:
+            version = self._versions.get(name)
+            if version is None or name in self._dirty:
+                return None
+            parts.append(f"{name[0]}{version}")
+        if volatile:
+            # Данные, зависящие от бронирований и NOW(), живут окнами volatile_seconds.
+            parts.append(f"t{int(time.time() // self.volatile_seconds)}")
+        return '"' + "-".join(parts) + '"'
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        name, _, version = payload.partition(":")
+        if int(version) > self._versions.get(name, -1):
+            self._versions[name] = int(version)
+        self._dirty.discard(name)
+        self._changed(name)
+
+    async def _listen(self) -> None:
+        while True:
+            conn = None
+            try:
+                conn = await asyncpg.connect(ASYNCPG_DSN)
+                closed = asyncio.Event()
+                conn.add_termination_listener(lambda _: closed.set())
+                await conn.add_listener(CHANNEL, self._on_notify)
+                rows = await conn.fetch("SELECT name, version FROM catalog_versions")
+                self._versions = {row["name"]: row["version"] for row in rows}
+                self._dirty.clear()
+                # Уведомления, пришедшие до подписки, потеряны.
+                for name in list(self._subscribers):
+                    self._changed(name)
+                await closed.wait()
+            except asyncio.CancelledError:
+                if conn is not None:
+                    await conn.close()
+                raise
+            except (OSError, asyncpg.PostgresError) as e:
+                print(f"catalog_changed LISTEN недоступен: {e}")
+            self._versions = {}
+            await asyncio.sleep(self.reconnect_seconds)
+
+    def start(self) -> None:
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+
+catalog_versions = CatalogVersions(
+    reconnect_seconds=settings.catalog.reconnect_seconds,
+    volatile_seconds=settings.catalog.etag_volatile_seconds,
+)
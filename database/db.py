@@ -1,6 +1,7 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 
 DATABASE_URL = "postgresql+asyncpg://killchik:killchik@pg:5432/films"
+ASYNCPG_DSN = DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://")
 
 engine = create_async_engine(DATABASE_URL)
 
@@ -4,7 +4,8 @@ CREATE TABLE IF NOT EXISTS users (
     email TEXT NOT NULL UNIQUE,
     password_hash BYTEA NOT NULL,
     role TEXT NOT NULL DEFAULT 'user',
-    created_at TIMESTAMP NOT NULL DEFAULT NOW()
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    active_bookings INT NOT NULL DEFAULT 0
 );
 
 CREATE TABLE IF NOT EXISTS films (
@@ -44,6 +45,64 @@ CREATE TABLE IF NOT EXISTS bookings (
     created_at TIMESTAMP NOT NULL DEFAULT NOW()
 );
 
+CREATE UNLOGGED TABLE IF NOT EXISTS seat_holds (
+    session_id INT NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
+    seat_number INT NOT NULL,
+    hold_id UUID NOT NULL,
+    user_id INT NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    expires_at TIMESTAMPTZ NOT NULL,
+    PRIMARY KEY (session_id, seat_number)
+);
+
+CREATE INDEX IF NOT EXISTS idx_seat_holds_hold
+ON seat_holds (hold_id);
+
+CREATE INDEX IF NOT EXISTS idx_seat_holds_user
+ON seat_holds (user_id);
+
+CREATE TABLE IF NOT EXISTS refresh_tokens (
+    jti UUID PRIMARY KEY,
+    family UUID NOT NULL,
+    user_id INT NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    expires_at TIMESTAMPTZ NOT NULL,
+    revoked BOOLEAN NOT NULL DEFAULT FALSE
+);
+
+CREATE INDEX IF NOT EXISTS idx_refresh_tokens_family
+ON refresh_tokens (family);
+
+CREATE INDEX IF NOT EXISTS idx_refresh_tokens_user_expires
+ON refresh_tokens (user_id, expires_at);
+
+CREATE TABLE IF NOT EXISTS s3_delete_outbox (
+    id BIGSERIAL PRIMARY KEY,
+    object_key TEXT NOT NULL,
+    attempts INT NOT NULL DEFAULT 0,
+    next_attempt_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    last_error TEXT,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_s3_delete_outbox_due
+ON s3_delete_outbox (next_attempt_at);
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'users' AND column_name = 'active_bookings'
+    ) THEN
+        ALTER TABLE users ADD COLUMN active_bookings INT NOT NULL DEFAULT 0;
+        UPDATE users u
+        SET active_bookings = (
+            SELECT COUNT(*)
+            FROM bookings b
+            WHERE b.user_id = u.id AND b.status = 'active'
+        );
+    END IF;
+END;
+$$;
+
 DO $$
 BEGIN
     IF EXISTS (
@@ -61,6 +120,70 @@ BEGIN
 END
 $$;
 
+CREATE INDEX IF NOT EXISTS idx_bookings_session_created
+ON bookings (session_id, created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_bookings_user_created
+ON bookings (user_id, created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_bookings_created
+ON bookings (created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_films_rating
+ON films (rating DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_films_active_rating
+ON films (rating DESC, id DESC)
+WHERE is_active;
+
+CREATE INDEX IF NOT EXISTS idx_films_genre_rating
+ON films (genre, rating DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_films_active_genre_rating
+ON films (genre, rating DESC, id DESC)
+WHERE is_active;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'films' AND column_name = 'search_vector'
+    ) THEN
+        ALTER TABLE films ADD COLUMN search_vector TSVECTOR GENERATED ALWAYS AS (
+            setweight(to_tsvector('russian', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('russian', coalesce(genre, '')), 'B') ||
+            setweight(to_tsvector('russian', coalesce(description, '')), 'C')
+        ) STORED;
+    END IF;
+END;
+$$;
+
+CREATE INDEX IF NOT EXISTS idx_films_search
+ON films USING GIN (search_vector);
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'films' AND column_name = 'image_variants'
+    ) THEN
+        ALTER TABLE films ADD COLUMN image_variants JSONB;
+    END IF;
+END;
+$$;
+
+CREATE INDEX IF NOT EXISTS idx_halls_name
+ON halls (name, id);
+
+CREATE INDEX IF NOT EXISTS idx_sessions_start_time
+ON sessions (start_time DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_sessions_film_start_time
+ON sessions (film_id, start_time, id);
+
+CREATE INDEX IF NOT EXISTS idx_sessions_hall_start_time
+ON sessions (hall_id, start_time, id);
+
 
 CREATE OR REPLACE FUNCTION add_session(
     _film_id INT,
@@ -99,6 +222,42 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+DROP FUNCTION IF EXISTS reserve_active_bookings(INT, INT);
+
+-- Живые удержания пользователя входят в лимит, как в hold_seats: иначе, держа 5 мест,
+-- можно забронировать шестое напрямую, и confirm_hold потом не пройдёт. Подтверждаемое
+-- удержание передаётся в _exclude_hold, чтобы не считать его места дважды.
+CREATE OR REPLACE FUNCTION reserve_active_bookings(
+    _user_id INT,
+    _count INT,
+    _exclude_hold UUID DEFAULT NULL
+)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    _active_count INT;
+BEGIN
+    SELECT active_bookings INTO _active_count
+    FROM users
+    WHERE id = _user_id
+    FOR UPDATE;
+    SELECT _active_count + COUNT(*) INTO _active_count
+    FROM seat_holds
+    WHERE user_id = _user_id
+      AND expires_at > NOW()
+      AND hold_id IS DISTINCT FROM _exclude_hold;
+    IF _active_count IS NULL OR _active_count + _count > 5 THEN
+        RAISE EXCEPTION
+            'User % cannot have more than 5 active bookings',
+            _user_id;
+    END IF;
+    UPDATE users
+    SET active_bookings = active_bookings + _count
+    WHERE id = _user_id;
+END;
+$$;
+
 CREATE OR REPLACE FUNCTION add_booking(
     _user_id INT,
     _session_id INT,
@@ -108,34 +267,306 @@ RETURNS SETOF bookings
 LANGUAGE plpgsql
 AS $$
 DECLARE
-    _session sessions;
+    _total_seats INT;
 BEGIN
-    SELECT *
-    INTO _session
+    SELECT total_seats
+    INTO _total_seats
     FROM sessions
-    WHERE id = _session_id;
+    WHERE id = _session_id
+    FOR UPDATE;
     IF NOT FOUND THEN
         RAISE EXCEPTION 'Session % not found', _session_id;
     END IF;
-    IF _seat_number <= 0 OR _seat_number > _session.total_seats THEN
+    IF _seat_number <= 0 OR _seat_number > _total_seats THEN
         RAISE EXCEPTION 'Invalid seat number %', _seat_number;
     END IF;
     IF EXISTS (
-        SELECT 1 FROM bookings
+        SELECT 1 FROM seat_holds
         WHERE session_id = _session_id
           AND seat_number = _seat_number
-          AND status = 'active'
+          AND user_id <> _user_id
+          AND expires_at > NOW()
     ) THEN
-        RAISE EXCEPTION 'Seat % is already booked', _seat_number;
+        RAISE EXCEPTION 'Seat % is held by another user', _seat_number;
     END IF;
     RETURN QUERY
     INSERT INTO bookings (user_id, session_id, seat_number)
     VALUES (_user_id, _session_id, _seat_number)
+    ON CONFLICT (session_id, seat_number) WHERE status = 'active' DO NOTHING
+    RETURNING *;
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Seat % is already booked', _seat_number;
+    END IF;
+    PERFORM reserve_active_bookings(_user_id, 1);
+    UPDATE sessions
+    SET available_seats = available_seats - 1
+    WHERE id = _session_id;
+    DELETE FROM seat_holds
+    WHERE session_id = _session_id
+      AND seat_number = _seat_number;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION add_bookings(
+    _user_id INT,
+    _session_id INT,
+    _seat_numbers INT[]
+)
+RETURNS SETOF bookings
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    _session sessions;
+    _conflicts JSONB;
+BEGIN
+    SELECT *
+    INTO _session
+    FROM sessions
+    WHERE id = _session_id
+    FOR UPDATE;
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Session % not found', _session_id;
+    END IF;
+    SELECT jsonb_agg(
+        jsonb_build_object(
+            'seat_number', req.seat,
+            'reason', CASE
+                WHEN req.seat <= 0 OR req.seat > _session.total_seats THEN 'invalid'
+                WHEN b.id IS NOT NULL THEN 'booked'
+                ELSE 'held'
+            END
+        ) ORDER BY req.seat
+    )
+    INTO _conflicts
+    FROM unnest(_seat_numbers) AS req(seat)
+    LEFT JOIN bookings b
+        ON b.session_id = _session_id
+        AND b.seat_number = req.seat
+        AND b.status = 'active'
+    LEFT JOIN seat_holds h
+        ON h.session_id = _session_id
+        AND h.seat_number = req.seat
+        AND h.user_id <> _user_id
+        AND h.expires_at > NOW()
+    WHERE req.seat <= 0
+       OR req.seat > _session.total_seats
+       OR b.id IS NOT NULL
+       OR h.hold_id IS NOT NULL;
+    IF _conflicts IS NOT NULL THEN
+        RAISE EXCEPTION 'Seats are not available for session %', _session_id
+            USING DETAIL = _conflicts::text;
+    END IF;
+    PERFORM reserve_active_bookings(_user_id, cardinality(_seat_numbers));
+    UPDATE sessions
+    SET available_seats = available_seats - cardinality(_seat_numbers)
+    WHERE id = _session_id;
+    DELETE FROM seat_holds
+    WHERE session_id = _session_id
+      AND seat_number = ANY(_seat_numbers);
+    RETURN QUERY
+    INSERT INTO bookings (user_id, session_id, seat_number)
+    SELECT _user_id, _session_id, req.seat
+    FROM unnest(_seat_numbers) AS req(seat)
+    ORDER BY req.seat
     RETURNING *;
 END;
 $$;
 
 
+CREATE OR REPLACE FUNCTION add_bookings_group(
+    _session_id INT,
+    _user_ids INT[],
+    _seat_numbers INT[]
+)
+RETURNS TABLE(
+    request_index INT,
+    booking_id INT,
+    booked_at TIMESTAMP,
+    error TEXT
+)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    _booking bookings;
+BEGIN
+    PERFORM 1 FROM sessions WHERE id = _session_id FOR UPDATE;
+    FOR i IN 1 .. cardinality(_user_ids) LOOP
+        request_index := i;
+        booking_id := NULL;
+        booked_at := NULL;
+        error := NULL;
+        BEGIN
+            SELECT * INTO _booking
+            FROM add_booking(_user_ids[i], _session_id, _seat_numbers[i]);
+            booking_id := _booking.id;
+            booked_at := _booking.created_at;
+        EXCEPTION
+            -- Отказ по бизнес-правилу относится к одному запросу; остальные ошибки
+            -- (в том числе взаимоблокировку, её повторяет apply_batch) роняют пачку.
+            WHEN raise_exception OR unique_violation THEN
+                error := SQLERRM;
+        END;
+        RETURN NEXT;
+    END LOOP;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION hold_seats(
+    _user_id INT,
+    _session_id INT,
+    _seat_numbers INT[],
+    _ttl_seconds INT
+)
+RETURNS SETOF seat_holds
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    _session sessions;
+    _conflicts JSONB;
+    _active_count INT;
+    _hold_id UUID := gen_random_uuid();
+BEGIN
+    SELECT *
+    INTO _session
+    FROM sessions
+    WHERE id = _session_id
+    FOR UPDATE;
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Session % not found', _session_id;
+    END IF;
+    DELETE FROM seat_holds
+    WHERE session_id = _session_id
+      AND expires_at <= NOW();
+    SELECT jsonb_agg(
+        jsonb_build_object(
+            'seat_number', req.seat,
+            'reason', CASE
+                WHEN req.seat <= 0 OR req.seat > _session.total_seats THEN 'invalid'
+                WHEN b.id IS NOT NULL THEN 'booked'
+                ELSE 'held'
+            END
+        ) ORDER BY req.seat
+    )
+    INTO _conflicts
+    FROM unnest(_seat_numbers) AS req(seat)
+    LEFT JOIN bookings b
+        ON b.session_id = _session_id
+        AND b.seat_number = req.seat
+        AND b.status = 'active'
+    LEFT JOIN seat_holds h
+        ON h.session_id = _session_id
+        AND h.seat_number = req.seat
+    WHERE req.seat <= 0
+       OR req.seat > _session.total_seats
+       OR b.id IS NOT NULL
+       OR h.hold_id IS NOT NULL;
+    IF _conflicts IS NOT NULL THEN
+        RAISE EXCEPTION 'Seats are not available for session %', _session_id
+            USING DETAIL = _conflicts::text;
+    END IF;
+    -- Блокировка строки пользователя не даёт параллельным удержаниям пройти лимит вместе.
+    SELECT active_bookings INTO _active_count
+    FROM users
+    WHERE id = _user_id
+    FOR UPDATE;
+    SELECT _active_count + COUNT(*) INTO _active_count
+    FROM seat_holds
+    WHERE user_id = _user_id
+      AND expires_at > NOW();
+    IF _active_count + cardinality(_seat_numbers) > 5 THEN
+        RAISE EXCEPTION
+            'User % cannot have more than 5 active bookings',
+            _user_id;
+    END IF;
+    RETURN QUERY
+    INSERT INTO seat_holds (session_id, seat_number, hold_id, user_id, expires_at)
+    SELECT
+        _session_id,
+        req.seat,
+        _hold_id,
+        _user_id,
+        NOW() + make_interval(secs => _ttl_seconds)
+    FROM unnest(_seat_numbers) AS req(seat)
+    RETURNING *;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION confirm_hold(
+    _hold_id UUID,
+    _user_id INT
+)
+RETURNS SETOF bookings
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    _session_id INT;
+    _seats INT[];
+    _held INT;
+BEGIN
+    SELECT session_id
+    INTO _session_id
+    FROM seat_holds
+    WHERE hold_id = _hold_id
+      AND user_id = _user_id
+    LIMIT 1;
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Hold % not found', _hold_id;
+    END IF;
+    PERFORM 1 FROM sessions WHERE id = _session_id FOR UPDATE;
+    SELECT
+        array_agg(seat_number ORDER BY seat_number) FILTER (WHERE expires_at > NOW()),
+        COUNT(*)
+    INTO _seats, _held
+    FROM seat_holds
+    WHERE hold_id = _hold_id;
+    IF _seats IS NULL THEN
+        RAISE EXCEPTION 'Hold % has expired', _hold_id;
+    END IF;
+    -- Частичное подтверждение не выполняется: клиент получает истёкшие места.
+    IF cardinality(_seats) < _held THEN
+        RAISE EXCEPTION 'Hold % has partially expired', _hold_id
+            USING DETAIL = (
+                SELECT jsonb_agg(
+                    jsonb_build_object('seat_number', seat_number, 'reason', 'expired')
+                    ORDER BY seat_number
+                )::text
+                FROM seat_holds
+                WHERE hold_id = _hold_id
+                  AND NOT (seat_number = ANY(_seats))
+            );
+    END IF;
+    PERFORM reserve_active_bookings(_user_id, cardinality(_seats), _hold_id);
+    DELETE FROM seat_holds WHERE hold_id = _hold_id;
+    UPDATE sessions
+    SET available_seats = available_seats - cardinality(_seats)
+    WHERE id = _session_id;
+    RETURN QUERY
+    INSERT INTO bookings (user_id, session_id, seat_number)
+    SELECT _user_id, _session_id, req.seat
+    FROM unnest(_seats) AS req(seat)
+    RETURNING *;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION release_hold(
+    _hold_id UUID,
+    _user_id INT
+)
+RETURNS SETOF seat_holds
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    RETURN QUERY
+    DELETE FROM seat_holds
+    WHERE hold_id = _hold_id
+      AND user_id = _user_id
+    RETURNING *;
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Hold % not found', _hold_id;
+    END IF;
+END;
+$$;
+
 CREATE OR REPLACE FUNCTION cancel_booking(
     _booking_id INT,
     _user_id INT
@@ -156,19 +587,107 @@ BEGIN
     IF _booking.user_id <> _user_id THEN
         RAISE EXCEPTION 'Forbidden: booking does not belong to user';
     END IF;
-    IF _booking.status <> 'active' THEN
+    PERFORM 1 FROM sessions WHERE id = _booking.session_id FOR UPDATE;
+    UPDATE bookings
+    SET status = 'canceled'
+    WHERE id = _booking_id
+      AND status = 'active'
+    RETURNING * INTO _booking;
+    IF NOT FOUND THEN
         RAISE EXCEPTION 'Booking already canceled';
     END IF;
     UPDATE sessions
     SET available_seats = available_seats + 1
     WHERE id = _booking.session_id;
+    UPDATE users
+    SET active_bookings = active_bookings - 1
+    WHERE id = _user_id;
+    RETURN NEXT _booking;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION cancel_session_bookings(_session_id INT)
+RETURNS SETOF bookings
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    PERFORM 1 FROM sessions WHERE id = _session_id FOR UPDATE;
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Session % not found', _session_id;
+    END IF;
+    DELETE FROM seat_holds WHERE session_id = _session_id;
+    RETURN QUERY
+    WITH canceled AS (
+        UPDATE bookings
+        SET status = 'canceled'
+        WHERE session_id = _session_id
+          AND status = 'active'
+        RETURNING *
+    ), released AS (
+        UPDATE users u
+        SET active_bookings = u.active_bookings - c.released
+        FROM (
+            SELECT user_id, COUNT(*) AS released
+            FROM canceled
+            GROUP BY user_id
+        ) c
+        WHERE u.id = c.user_id
+    )
+    SELECT * FROM canceled ORDER BY id;
+    UPDATE sessions
+    SET available_seats = total_seats - (
+        SELECT COUNT(*)
+        FROM bookings
+        WHERE session_id = _session_id AND status = 'active'
+    )
+    WHERE id = _session_id;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION cancel_user_bookings(_user_id INT)
+RETURNS SETOF bookings
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    _session_ids INT[];
+    _canceled INT;
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM users WHERE id = _user_id) THEN
+        RAISE EXCEPTION 'User % not found', _user_id;
+    END IF;
+    SELECT array_agg(locked.id)
+    INTO _session_ids
+    FROM (
+        SELECT s.id
+        FROM sessions s
+        WHERE s.id IN (
+            SELECT b.session_id
+            FROM bookings b
+            WHERE b.user_id = _user_id AND b.status = 'active'
+        )
+        ORDER BY s.id
+        FOR UPDATE
+    ) locked;
+    RETURN QUERY
     UPDATE bookings
     SET status = 'canceled'
-    WHERE id = _booking_id;
-    RETURN QUERY
-    SELECT *
-    FROM bookings
-    WHERE id = _booking_id;
+    WHERE user_id = _user_id
+      AND status = 'active'
+      AND session_id = ANY(_session_ids)
+    RETURNING *;
+    -- Пересчёт без блокировки users мог бы затереть параллельную бронь другого
+    -- сеанса; уменьшаем счётчик ровно на отменённые строки.
+    GET DIAGNOSTICS _canceled = ROW_COUNT;
+    UPDATE users
+    SET active_bookings = active_bookings - _canceled
+    WHERE id = _user_id;
+    UPDATE sessions s
+    SET available_seats = s.total_seats - (
+        SELECT COUNT(*)
+        FROM bookings b
+        WHERE b.session_id = s.id AND b.status = 'active'
+    )
+    WHERE s.id = ANY(_session_ids);
 END;
 $$;
 
@@ -184,37 +703,50 @@ BEGIN
 END;
 $$;
 
-CREATE OR REPLACE FUNCTION check_active_bookings_limit()
+DROP TRIGGER IF EXISTS trg_check_active_bookings_limit ON bookings;
+
+DROP TRIGGER IF EXISTS trg_check_seat_availability ON bookings;
+
+DROP TRIGGER IF EXISTS trg_update_session_capacity ON bookings;
+
+DROP TRIGGER IF EXISTS trg_restore_capacity_on_cancel ON bookings;
+
+DROP FUNCTION IF EXISTS check_active_bookings_limit();
+
+DROP FUNCTION IF EXISTS check_seat_availability();
+
+DROP FUNCTION IF EXISTS update_session_capacity();
+
+DROP FUNCTION IF EXISTS restore_capacity_on_cancel();
+
+CREATE OR REPLACE FUNCTION release_deleted_bookings()
 RETURNS TRIGGER
 LANGUAGE plpgsql
 AS $$
-DECLARE
-    active_count INT;
 BEGIN
-    IF NEW.status = 'active' THEN
-        SELECT COUNT(*) INTO active_count
-        FROM bookings
-        WHERE user_id = NEW.user_id
-          AND status = 'active';
-        IF active_count >= 5 THEN
-            RAISE EXCEPTION
-                'User % cannot have more than 5 active bookings',
-                NEW.user_id;
-        END IF;
-    END IF;
-    RETURN NEW;
+    UPDATE users u
+    SET active_bookings = u.active_bookings - d.active_count
+    FROM (
+        SELECT user_id, COUNT(*) AS active_count
+        FROM deleted_bookings
+        WHERE status = 'active'
+        GROUP BY user_id
+    ) d
+    WHERE u.id = d.user_id;
+    RETURN NULL;
 END;
 $$;
 
 DO $$
 BEGIN
     IF NOT EXISTS (
-        SELECT 1 FROM pg_trigger WHERE tgname = 'trg_check_active_bookings_limit'
+        SELECT 1 FROM pg_trigger WHERE tgname = 'trg_release_deleted_bookings'
     ) THEN
-        CREATE TRIGGER trg_check_active_bookings_limit
-        BEFORE INSERT ON bookings
-        FOR EACH ROW
-        EXECUTE FUNCTION check_active_bookings_limit();
+        CREATE TRIGGER trg_release_deleted_bookings
+        AFTER DELETE ON bookings
+        REFERENCING OLD TABLE AS deleted_bookings
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION release_deleted_bookings();
     END IF;
 END;
 $$;
@@ -252,16 +784,11 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
-CREATE OR REPLACE FUNCTION check_seat_availability()
+CREATE OR REPLACE FUNCTION validate_rating()
 RETURNS TRIGGER AS $$
 BEGIN
-    IF EXISTS (
-        SELECT 1 FROM bookings
-        WHERE session_id = NEW.session_id
-          AND seat_number = NEW.seat_number
-          AND status = 'active'
-    ) THEN
-        RAISE EXCEPTION 'Seat % already booked for session %', NEW.seat_number, NEW.session_id;
+    IF NEW.rating < 0 OR NEW.rating > 10 THEN
+        RAISE EXCEPTION 'Rating must be between 0 and 10';
     END IF;
     RETURN NEW;
 END;
@@ -270,94 +797,259 @@ $$ LANGUAGE plpgsql;
 DO $$
 BEGIN
     IF NOT EXISTS (
-        SELECT 1 FROM pg_trigger WHERE tgname = 'trg_check_seat_availability'
+        SELECT 1 FROM pg_trigger WHERE tgname = 'trg_validate_rating'
     ) THEN
-        CREATE TRIGGER trg_check_seat_availability
-        BEFORE INSERT ON bookings
+        CREATE TRIGGER trg_validate_rating
+        BEFORE UPDATE ON films
         FOR EACH ROW
-        EXECUTE FUNCTION check_seat_availability();
+        EXECUTE FUNCTION validate_rating();
     END IF;
 END;
 $$;
 
+DROP TRIGGER IF EXISTS trg_notify_film_catalog ON films;
 
-CREATE OR REPLACE FUNCTION update_session_capacity()
-RETURNS TRIGGER AS $$
+DROP FUNCTION IF EXISTS notify_film_catalog();
+
+CREATE TABLE IF NOT EXISTS catalog_versions (
+    name TEXT PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO catalog_versions (name)
+VALUES ('films'), ('halls'), ('sessions'), ('users')
+ON CONFLICT (name) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION bump_catalog_version()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    _version BIGINT;
 BEGIN
-    UPDATE sessions
-    SET available_seats = available_seats - 1
-    WHERE id = NEW.session_id;
-    RETURN NEW;
+    UPDATE catalog_versions
+    SET version = version + 1
+    WHERE name = TG_TABLE_NAME
+    RETURNING version INTO _version;
+    PERFORM pg_notify('catalog_changed', TG_TABLE_NAME || ':' || _version);
+    RETURN NULL;
 END;
-$$ LANGUAGE plpgsql;
+$$;
 
 DO $$
 BEGIN
     IF NOT EXISTS (
-        SELECT 1 FROM pg_trigger WHERE tgname = 'trg_update_session_capacity'
+        SELECT 1 FROM pg_trigger WHERE tgname = 'trg_catalog_version_films'
     ) THEN
-        CREATE TRIGGER trg_update_session_capacity
-        AFTER INSERT ON bookings
-        FOR EACH ROW
-        EXECUTE FUNCTION update_session_capacity();
+        CREATE TRIGGER trg_catalog_version_films
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON films
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION bump_catalog_version();
+    END IF;
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_trigger WHERE tgname = 'trg_catalog_version_halls'
+    ) THEN
+        CREATE TRIGGER trg_catalog_version_halls
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON halls
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION bump_catalog_version();
+    END IF;
+    -- available_seats меняется при каждом бронировании и в версию не входит:
+    -- списки с ним получают ETag с коротким временным окном.
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_trigger WHERE tgname = 'trg_catalog_version_sessions'
+    ) THEN
+        CREATE TRIGGER trg_catalog_version_sessions
+        AFTER INSERT OR DELETE OR TRUNCATE OR UPDATE OF film_id, hall_id, start_time, price, total_seats ON sessions
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION bump_catalog_version();
+    END IF;
+    -- По версии users воркеры сбрасывают кэш пользователей после смены роли.
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_trigger WHERE tgname = 'trg_catalog_version_users'
+    ) THEN
+        CREATE TRIGGER trg_catalog_version_users
+        AFTER DELETE OR UPDATE OF role ON users
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION bump_catalog_version();
     END IF;
 END;
 $$;
 
-
-CREATE OR REPLACE FUNCTION restore_capacity_on_cancel()
-RETURNS TRIGGER AS $$
+CREATE OR REPLACE FUNCTION enqueue_film_image_delete()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
 BEGIN
-    IF OLD.status = 'active' AND NEW.status = 'canceled' THEN
-        UPDATE sessions
-        SET available_seats = (
-            SELECT total_seats - COUNT(*)
-            FROM bookings
-            WHERE session_id = NEW.session_id AND status = 'active'
-        )
-        WHERE id = NEW.session_id;
+    IF OLD.image_url IS NOT NULL
+       AND (TG_OP = 'DELETE' OR NEW.image_url IS DISTINCT FROM OLD.image_url) THEN
+        INSERT INTO s3_delete_outbox (object_key)
+        VALUES (substring(OLD.image_url FROM '[^/]+$'));
+        INSERT INTO s3_delete_outbox (object_key)
+        SELECT substring(variant.url FROM '[^/]+$')
+        FROM jsonb_each(COALESCE(OLD.image_variants, '{}'::jsonb)) AS fmt(name, widths),
+             jsonb_each_text(fmt.widths) AS variant(width, url);
     END IF;
-    RETURN NEW;
+    RETURN NULL;
 END;
-$$ LANGUAGE plpgsql;
+$$;
 
 DO $$
 BEGIN
     IF NOT EXISTS (
-        SELECT 1 FROM pg_trigger WHERE tgname = 'trg_restore_capacity_on_cancel'
+        SELECT 1 FROM pg_trigger WHERE tgname = 'trg_enqueue_film_image_delete'
     ) THEN
-        CREATE TRIGGER trg_restore_capacity_on_cancel
-        AFTER UPDATE ON bookings
+        CREATE TRIGGER trg_enqueue_film_image_delete
+        AFTER UPDATE OF image_url OR DELETE ON films
         FOR EACH ROW
-        EXECUTE FUNCTION restore_capacity_on_cancel();
+        EXECUTE FUNCTION enqueue_film_image_delete();
     END IF;
 END;
 $$;
 
+-- Общая часть ключей постера и его вариантов (sha256 содержимого или старый uuid).
+CREATE OR REPLACE FUNCTION poster_stem(_key_or_url TEXT)
+RETURNS TEXT
+LANGUAGE sql
+IMMUTABLE
+AS $$
+    SELECT split_part(split_part(substring(_key_or_url FROM '[^/]+$'), '.', 1), '_', 1);
+$$;
+
+CREATE INDEX IF NOT EXISTS idx_films_poster_stem
+ON films (poster_stem(image_url))
+WHERE image_url IS NOT NULL;
 
-CREATE OR REPLACE FUNCTION validate_rating()
-RETURNS TRIGGER AS $$
-BEGIN
-    IF NEW.rating < 0 OR NEW.rating > 10 THEN
-        RAISE EXCEPTION 'Rating must be between 0 and 10';
-    END IF;
-    RETURN NEW;
-END;
-$$ LANGUAGE plpgsql;
+-- Объекты адресуются по содержимому, и один постер может принадлежать нескольким фильмам.
+CREATE OR REPLACE FUNCTION poster_key_in_use(_key TEXT)
+RETURNS BOOLEAN
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT EXISTS (
+        SELECT 1
+        FROM films f
+        WHERE f.image_url IS NOT NULL
+          AND poster_stem(f.image_url) = poster_stem(_key)
+          AND (
+              substring(f.image_url FROM '[^/]+$') = _key
+              OR EXISTS (
+                  SELECT 1
+                  FROM jsonb_each(COALESCE(f.image_variants, '{}'::jsonb)) AS fmt(name, widths),
+                       jsonb_each_text(fmt.widths) AS variant(width, url)
+                  WHERE substring(variant.url FROM '[^/]+$') = _key
+              )
+          )
+    );
+$$;
 
 DO $$
 BEGIN
     IF NOT EXISTS (
-        SELECT 1 FROM pg_trigger WHERE tgname = 'trg_validate_rating'
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 's3_delete_outbox' AND column_name = 'claimed_until'
     ) THEN
-        CREATE TRIGGER trg_validate_rating
-        BEFORE UPDATE ON films
-        FOR EACH ROW
-        EXECUTE FUNCTION validate_rating();
+        ALTER TABLE s3_delete_outbox ADD COLUMN claimed_until TIMESTAMPTZ;
     END IF;
 END;
 $$;
 
+-- Загрузка постера закрепляет его стем до коммита ссылки в films: пока закрепление
+-- живо, s3_delete_worker не начинает удалять объекты этого стема.
+CREATE TABLE IF NOT EXISTS poster_pins (
+    id BIGSERIAL PRIMARY KEY,
+    stem TEXT NOT NULL,
+    expires_at TIMESTAMPTZ NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_poster_pins_stem
+ON poster_pins (stem, expires_at);
+
+-- Блокировка стема держится только внутри этой короткой транзакции: закрепление и
+-- claim_s3_deletes упорядочены, и загрузка видит удаления, начатые до закрепления.
+CREATE OR REPLACE FUNCTION pin_poster(_stem TEXT, _pin_seconds FLOAT)
+RETURNS BIGINT
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    _pin_id BIGINT;
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext(poster_stem(_stem)));
+    INSERT INTO poster_pins (stem, expires_at)
+    VALUES (poster_stem(_stem), NOW() + make_interval(secs => _pin_seconds))
+    RETURNING id INTO _pin_id;
+    RETURN _pin_id;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION poster_delete_in_flight(_stem TEXT)
+RETURNS BOOLEAN
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT EXISTS (
+        SELECT 1
+        FROM s3_delete_outbox
+        WHERE claimed_until > NOW()
+          AND poster_stem(object_key) = poster_stem(_stem)
+    );
+$$;
+
+-- Забирает пачку удалений: ключи, на которые ссылаются фильмы, снимаются с очереди,
+-- закреплённые стемы откладываются до конца закрепления, остальные помечаются
+-- claimed_until на время удаления из S3, которое идёт уже после коммита.
+CREATE OR REPLACE FUNCTION claim_s3_deletes(_limit INT, _claim_seconds FLOAT)
+RETURNS TABLE(job_id BIGINT, job_key TEXT, job_attempts INT)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    _ids BIGINT[];
+BEGIN
+    DELETE FROM poster_pins WHERE expires_at <= NOW();
+    SELECT array_agg(due.id)
+    INTO _ids
+    FROM (
+        SELECT o.id
+        FROM s3_delete_outbox o
+        WHERE o.next_attempt_at <= NOW()
+        ORDER BY o.next_attempt_at
+        LIMIT _limit
+        FOR UPDATE SKIP LOCKED
+    ) AS due;
+    IF _ids IS NULL THEN
+        RETURN;
+    END IF;
+    PERFORM pg_advisory_xact_lock(stems.lock_key)
+    FROM (
+        SELECT DISTINCT hashtext(poster_stem(o.object_key)) AS lock_key
+        FROM s3_delete_outbox o
+        WHERE o.id = ANY(_ids)
+        ORDER BY lock_key
+        OFFSET 0
+    ) AS stems;
+    DELETE FROM s3_delete_outbox o
+    WHERE o.id = ANY(_ids)
+      AND poster_key_in_use(o.object_key);
+    UPDATE s3_delete_outbox o
+    SET next_attempt_at = pins.expires_at
+    FROM (
+        SELECT p.stem, MAX(p.expires_at) AS expires_at
+        FROM poster_pins p
+        WHERE p.expires_at > NOW()
+        GROUP BY p.stem
+    ) AS pins
+    WHERE o.id = ANY(_ids)
+      AND pins.stem = poster_stem(o.object_key);
+    RETURN QUERY
+    UPDATE s3_delete_outbox o
+    SET claimed_until = NOW() + make_interval(secs => _claim_seconds),
+        next_attempt_at = NOW() + make_interval(secs => _claim_seconds)
+    WHERE o.id = ANY(_ids)
+      AND o.next_attempt_at <= NOW()
+    RETURNING o.id, o.object_key, o.attempts;
+END;
+$$;
+
 CREATE OR REPLACE VIEW vw_upcoming_sessions AS
 SELECT *
 FROM sessions
@@ -492,35 +1184,48 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+-- Проверки фильма в одном месте: add_film, update_film и импорт (FilmRepository).
+CREATE OR REPLACE FUNCTION film_error(_title TEXT, _genre TEXT, _duration INT, _rating FLOAT)
+RETURNS TEXT
+LANGUAGE sql
+IMMUTABLE
+AS $$
+    SELECT CASE
+        WHEN _rating < 0 OR _rating > 10 THEN 'Rating must be between 0 and 10'
+        WHEN _duration <= 0 THEN 'Duration must be positive'
+        WHEN _title IS NULL OR _title = '' THEN 'Title is required'
+        WHEN _genre IS NULL OR _genre = '' THEN 'Genre is required'
+    END;
+$$;
+
+DROP FUNCTION IF EXISTS add_film(TEXT, TEXT, INT, FLOAT, TEXT, TEXT);
+
 CREATE OR REPLACE FUNCTION add_film(
     _title TEXT,
     _genre TEXT,
     _duration INT,
     _rating FLOAT,
     _description TEXT,
-    _image_url TEXT DEFAULT NULL
+    _image_url TEXT DEFAULT NULL,
+    _image_variants JSONB DEFAULT NULL
 )
 RETURNS SETOF films AS $$
+DECLARE
+    _error TEXT;
 BEGIN
-    IF _rating < 0 OR _rating > 10 THEN
-        RAISE EXCEPTION 'Rating must be between 0 and 10';
-    END IF;
-    IF _duration <= 0 THEN
-        RAISE EXCEPTION 'Duration must be positive';
-    END IF;
-    IF _title IS NULL OR _title = '' THEN
-        RAISE EXCEPTION 'Title is required';
-    END IF;
-    IF _genre IS NULL OR _genre = '' THEN
-        RAISE EXCEPTION 'Genre is required';
+    _error := film_error(_title, _genre, _duration, _rating);
+    IF _error IS NOT NULL THEN
+        RAISE EXCEPTION '%', _error;
     END IF;
     RETURN QUERY
-    INSERT INTO films (title, genre, duration, rating, description, image_url)
-    VALUES (_title, _genre, _duration, _rating, _description, _image_url)
+    INSERT INTO films (title, genre, duration, rating, description, image_url, image_variants)
+    VALUES (_title, _genre, _duration, _rating, _description, _image_url, _image_variants)
     RETURNING *;
 END;
 $$ LANGUAGE plpgsql;
 
+DROP FUNCTION IF EXISTS update_film(INT, TEXT, TEXT, INT, FLOAT, TEXT, BOOLEAN, TEXT);
+
 CREATE OR REPLACE FUNCTION update_film(
     _film_id INT,
     _title TEXT,
@@ -529,24 +1234,19 @@ CREATE OR REPLACE FUNCTION update_film(
     _rating FLOAT,
     _description TEXT,
     _is_active BOOLEAN,
-    _image_url TEXT DEFAULT NULL
+    _image_url TEXT DEFAULT NULL,
+    _image_variants JSONB DEFAULT NULL
 )
 RETURNS SETOF films AS $$
+DECLARE
+    _error TEXT;
 BEGIN
     IF NOT EXISTS (SELECT 1 FROM films WHERE id = _film_id) THEN
         RAISE EXCEPTION 'Film not found';
     END IF;
-    IF _rating < 0 OR _rating > 10 THEN
-        RAISE EXCEPTION 'Rating must be between 0 and 10';
-    END IF;
-    IF _duration <= 0 THEN
-        RAISE EXCEPTION 'Duration must be positive';
-    END IF;
-    IF _title IS NULL OR _title = '' THEN
-        RAISE EXCEPTION 'Title is required';
-    END IF;
-    IF _genre IS NULL OR _genre = '' THEN
-        RAISE EXCEPTION 'Genre is required';
+    _error := film_error(_title, _genre, _duration, _rating);
+    IF _error IS NOT NULL THEN
+        RAISE EXCEPTION '%', _error;
     END IF;
     RETURN QUERY
     UPDATE films
@@ -556,7 +1256,8 @@ BEGIN
         rating = _rating,
         description = _description,
         is_active = _is_active,
-        image_url = _image_url
+        image_url = _image_url,
+        image_variants = _image_variants
     WHERE id = _film_id
     RETURNING *;
 END;
@@ -645,4 +1346,69 @@ BEGIN
     WHERE b.user_id = _user_id
     ORDER BY b.created_at DESC;
 END;
-$$ LANGUAGE plpgsql;
\ No newline at end of file
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION issue_refresh_token(
+    _jti UUID,
+    _family UUID,
+    _user_id INT,
+    _expires_at TIMESTAMPTZ
+)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    DELETE FROM refresh_tokens
+    WHERE user_id = _user_id
+      AND expires_at < NOW();
+    INSERT INTO refresh_tokens (jti, family, user_id, expires_at)
+    VALUES (_jti, _family, _user_id, _expires_at);
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION rotate_refresh_token(
+    _jti UUID,
+    _new_jti UUID,
+    _expires_at TIMESTAMPTZ
+)
+RETURNS TABLE(
+    id INT,
+    name TEXT,
+    email TEXT,
+    role TEXT
+)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    _token refresh_tokens%ROWTYPE;
+BEGIN
+    SELECT * INTO _token
+    FROM refresh_tokens t
+    WHERE t.jti = _jti
+    FOR UPDATE;
+    IF NOT FOUND OR _token.expires_at <= NOW() THEN
+        RETURN;
+    END IF;
+    IF _token.revoked THEN
+        -- Повторное предъявление уже обменянного токена: отзываем всю цепочку.
+        DELETE FROM refresh_tokens t WHERE t.family = _token.family;
+        RETURN;
+    END IF;
+    UPDATE refresh_tokens t SET revoked = TRUE WHERE t.jti = _jti;
+    PERFORM issue_refresh_token(_new_jti, _token.family, _token.user_id, _expires_at);
+    RETURN QUERY
+    SELECT u.id, u.name, u.email, u.role
+    FROM users u
+    WHERE u.id = _token.user_id;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION revoke_refresh_token_family(_jti UUID)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    DELETE FROM refresh_tokens t
+    WHERE t.family = (SELECT family FROM refresh_tokens WHERE refresh_tokens.jti = _jti);
+END;
+$$;
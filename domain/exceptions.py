@@ -62,4 +62,46 @@ class FilmAlreadyExistsError(DomainError):
 
 class HallHasFutureSessionsError(DomainError):
     """Нельзя удалить зал с будущими сеансами"""
-    pass
\ No newline at end of file
+    pass
+
+class SeatsUnavailableError(DomainError):
+    """Часть запрошенных мест недоступна для бронирования"""
+
+    def __init__(self, message: str, conflicts: list[dict]):
+        super().__init__(message)
+        self.conflicts = conflicts
+
+
+class InvalidCursorError(DomainError):
+    """Некорректный курсор пагинации"""
+    pass
+
+
+class HoldNotFoundError(DomainError):
+    """Удержание мест не найдено или истекло"""
+    pass
+
+
+class UserNotFoundError(DomainError):
+    """Пользователь не найден"""
+    pass
+
+
+class IdempotencyKeyMismatchError(DomainError):
+    """Ключ идемпотентности уже использован с другим запросом"""
+    pass
+
+
+class InvalidRefreshTokenError(DomainError):
+    """Refresh-токен недействителен, отозван или уже использован"""
+    pass
+
+
+class PasswordHasherBusyError(DomainError):
+    """Очередь хеширования паролей переполнена"""
+    pass
+
+
+class FilmImportFormatError(DomainError):
+    """Тело импорта фильмов не удалось разобрать"""
+    pass
@@ -1,10 +1,27 @@
 from typing import Protocol
-from schemas.bookings import Booking, NewBooking, BookingDetailed
+
+from domain.exceptions import DomainError
+from schemas.bookings import Booking, NewBooking, BookingDetailed, NewBookingBatch
+from schemas.pagination import Page
 
 
 class IBookingRepository(Protocol):
 
     async def create(self, user_id: int, data: NewBooking) -> Booking: ...
+    async def create_many(self, user_id: int, data: NewBookingBatch) -> list[Booking]: ...
+    async def create_group(
+        self, session_id: int, requests: list[tuple[int, NewBooking]]
+    ) -> list[Booking | DomainError]: ...
     async def cancel(self, booking_id: int, user_id: int) -> Booking: ...
-    async def get_all(self) -> list[Booking]: ...
+    async def cancel_session_bookings(self, session_id: int) -> list[Booking]: ...
+    async def cancel_user_bookings(self, user_id: int) -> list[Booking]: ...
+    async def get_all(
+        self,
+        limit: int,
+        after: str | None = None,
+        session_id: int | None = None,
+        user_id: int | None = None,
+        status: str | None = None,
+    ) -> Page[Booking]: ...
+    async def get_session_bookings(self, session_id: int) -> list[Booking]: ...
     async def get_user_bookings(self, user_id: int) -> list[BookingDetailed]: ...
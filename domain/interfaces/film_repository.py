@@ -1,23 +1,49 @@
 from typing import Protocol
-from schemas.films import Film, NewFilm
+from schemas.films import Film, FilmFilters, FilmPage, NewFilm
+from schemas.pagination import Page
 from schemas.sessions import Session
 
 
 class IFilmRepository(Protocol):
 
-    async def get_all_films(self) -> list[Film]: ...
+    async def get_all_films(
+            self,
+            limit: int,
+            after: str | None = None,
+            filters: FilmFilters = FilmFilters(),
+    ) -> Page[Film]: ...
+
+    async def search(self, q: str, limit: int, offset: int) -> list[Film]: ...
+
+    async def add_film(
+            self,
+            film: NewFilm,
+            image_url: str | None = None,
+            image_variants: dict | None = None,
+    ) -> Film: ...
 
-    async def add_film(self, film: NewFilm, image_url: str | None = None) -> Film: ...
+    async def start_import(self) -> None: ...
+
+    async def copy_import_rows(self, records: list[tuple]) -> None: ...
+
+    async def reject_import_rows(self, limit: int, upsert: bool = False) -> tuple[int, list[tuple[int, str]]]: ...
+
+    async def finish_import(self, upsert: bool = False) -> tuple[int, int]: ...
+
+    async def abort_import(self) -> None: ...
 
     async def get_by_id(self, id: int) -> Film | None: ...
 
     async def delete(self, id: int) -> None: ...
 
+    async def get_page(self, film_id: int) -> FilmPage | None: ...
+
     async def get_sessions_by_film_id(self, film_id: int) -> list[Session]: ...
     async def update_film(
             self,
             film_id: int,
             film_data: NewFilm,
             image_url: str | None = None,
-            is_active: bool = True
+            is_active: bool = True,
+            image_variants: dict | None = None,
     ) -> Film: ...
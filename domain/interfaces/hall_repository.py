@@ -1,9 +1,10 @@
 from typing import Protocol
 
 from schemas.halls import HallCreate, Hall
+from schemas.pagination import Page
 
 
 class IHallRepository(Protocol):
     async def add_hall(self, hall: HallCreate): ...
-    async def get_all_halls(self) -> list[Hall]: ...
+    async def get_all_halls(self, limit: int, after: str | None = None) -> Page[Hall]: ...
     async def delete_hall(self, id) -> None: ...
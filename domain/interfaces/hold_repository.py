@@ -0,0 +1,12 @@
+from typing import Protocol
+from uuid import UUID
+
+from schemas.bookings import Booking
+from schemas.holds import NewSeatHold, SeatHold
+
+
+class IHoldRepository(Protocol):
+
+    async def hold(self, user_id: int, data: NewSeatHold) -> SeatHold: ...
+    async def confirm(self, hold_id: UUID, user_id: int) -> list[Booking]: ...
+    async def release(self, hold_id: UUID, user_id: int) -> SeatHold: ...
@@ -0,0 +1,13 @@
+from datetime import datetime
+from typing import Protocol
+from uuid import UUID
+
+from schemas.users import User
+
+
+class IRefreshTokenRepository(Protocol):
+
+    async def issue(self, jti: UUID, family: UUID, user_id: int, expires_at: datetime) -> None: ...
+    async def rotate(self, jti: UUID, new_jti: UUID, expires_at: datetime) -> User | None: ...
+    async def revoke_family(self, jti: UUID) -> None: ...
+    async def revoke_user(self, user_id: int) -> None: ...
@@ -0,0 +1,12 @@
+from typing import Protocol
+
+
+class IS3OutboxRepository(Protocol):
+
+    async def enqueue(self, keys: list[str]) -> None: ...
+    async def claim(self, limit: int, claim_seconds: float) -> list[tuple[int, str, int]]: ...
+    async def pin(self, stem: str, pin_seconds: float) -> int: ...
+    async def unpin(self, pin_id: int) -> None: ...
+    async def delete_in_flight(self, stem: str) -> bool: ...
+    async def complete(self, ids: list[int]) -> None: ...
+    async def retry_later(self, id: int, error: str, delay_seconds: float) -> None: ...
@@ -1,8 +1,27 @@
-from typing import Protocol
+from typing import BinaryIO, Protocol
 
 
 class IS3Repository(Protocol):
 
-    async def upload_file(self, image: bytes, key: str): ...
+    def url_for(self, key: str) -> str: ...
+
+    async def exists(self, key: str) -> bool: ...
+
+    async def upload_file(
+        self,
+        image: bytes,
+        key: str,
+        content_type: str | None = None,
+        cache_control: str | None = None,
+    ): ...
+
+    async def upload_fileobj(
+        self,
+        fileobj: BinaryIO,
+        key: str,
+        size: int,
+        content_type: str | None = None,
+        cache_control: str | None = None,
+    ): ...
 
     async def delete(self, key: str) -> None: ...
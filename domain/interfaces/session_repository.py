@@ -1,12 +1,26 @@
 from typing import Protocol
 
+from schemas.holds import SeatHold
+from schemas.pagination import Page
 from schemas.sessions import NewSession, Session
 
 
 class ISessionRepository(Protocol):
 
     async def add_session(self, data: NewSession) -> Session: ...
-    async def get_all_sessions(self) -> list[Session]:
+    async def get_all_sessions(
+            self,
+            limit: int,
+            after: str | None = None,
+            film_id: int | None = None,
+            hall_id: int | None = None,
+    ) -> Page[Session]:
+        ...
+
+    async def get_seat_state(self, session_id: int) -> tuple[int, list[int]] | None:
+        ...
+
+    async def get_session_holds(self, session_id: int) -> list[SeatHold]:
         ...
 
     async def delete_session(self, session_id: int) -> None:
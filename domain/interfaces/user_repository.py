@@ -13,3 +13,5 @@ class IUserRepository(Protocol):
     async def get_by_email(self, email: EmailStr) -> UserLogin | None: ...
     async def delete_user(self, id: int) -> User: ...
     async def get_by_id(self, id: int) -> User: ...
+    async def update_password_hash(self, user_id: int, password_hash: bytes) -> None: ...
+    async def set_role(self, user_id: int, role: str) -> User | None: ...
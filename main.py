@@ -4,18 +4,36 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from database.init_db import init_db
+from services.booking_service import booking_queue
+from database.catalog_versions import catalog_versions
+from services.film_catalog import film_catalog
+from services.password_hasher import password_hasher
+from services.poster_renderer import poster_renderer
+from services.s3_outbox import s3_delete_worker
+from repositories.s3_repository import s3_repository
 from routers.auth import router as auth_router
 from routers.films import router as film_router
 from routers.halls import router as hall_router
 from routers.sessions import router as session_router
 from routers.bookings import router as booking_router
+from routers.holds import router as hold_router
 from routers.views_router import router as views_router
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db()
+    await film_catalog.warm()
+    await s3_repository.start()
+    catalog_versions.start()
+    s3_delete_worker.start()
     yield
+    await s3_delete_worker.close()
+    await s3_repository.close()
+    await catalog_versions.close()
+    await booking_queue.close()
+    password_hasher.close()
+    poster_renderer.close()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -25,6 +43,7 @@ app.include_router(film_router)
 app.include_router(hall_router)
 app.include_router(session_router)
 app.include_router(booking_router)
+app.include_router(hold_router)
 app.include_router(views_router)
 
 origins = [
@@ -1,12 +1,17 @@
+from datetime import datetime
+
 from fastapi import Depends
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from database.db import get_session
 from domain.interfaces.booking_repository import IBookingRepository
-from domain.exceptions import DomainError
-from schemas.bookings import Booking, NewBooking, BookingDetailed
+from domain.exceptions import DomainError, SeatsUnavailableError, SessionNotFoundError, UserNotFoundError
+from schemas.bookings import Booking, NewBooking, BookingDetailed, NewBookingBatch
+from schemas.pagination import Page
+from utils.pagination import keyset_condition, build_page
 import asyncpg
+import json
 from sqlalchemy.exc import DBAPIError
 
 
@@ -45,6 +50,85 @@ class BookingRepository(IBookingRepository):
         row = result.fetchone()
         return Booking(**row._mapping)
 
+    async def create_many(self, user_id: int, data: NewBookingBatch) -> list[Booking]:
+        query = text(
+            """
+            SELECT *
+            FROM add_bookings(:user_id, :session_id, :seat_numbers);
+        """
+        )
+
+        try:
+            result = await self.session.execute(
+                query,
+                {
+                    "user_id": user_id,
+                    "session_id": data.session_id,
+                    "seat_numbers": data.seat_numbers,
+                },
+            )
+            rows = result.fetchall()
+            await self.session.commit()
+
+        except DBAPIError as e:
+            await self.session.rollback()
+            cause = getattr(e.orig, "__cause__", None)
+
+            if isinstance(cause, asyncpg.exceptions.RaiseError):
+                msg = str(cause).replace("ERROR:  ", "")
+                if cause.detail:
+                    raise SeatsUnavailableError(msg, json.loads(cause.detail))
+                raise DomainError(msg)
+
+            if isinstance(cause, asyncpg.exceptions.UniqueViolationError):
+                raise DomainError("Some of the seats were booked concurrently")
+
+            raise
+
+        return [Booking(**row._mapping) for row in rows]
+
+    async def create_group(
+            self, session_id: int, requests: list[tuple[int, NewBooking]]
+    ) -> list[Booking | DomainError]:
+        """
+        Применяет пачку одиночных бронирований одного сеанса одной транзакцией.
+        Ошибка одного запроса не откатывает остальные: для него возвращается DomainError.
+        """
+        query = text(
+            """
+            SELECT *
+            FROM add_bookings_group(:session_id, :user_ids, :seat_numbers);
+        """
+        )
+
+        result = await self.session.execute(
+            query,
+            {
+                "session_id": session_id,
+                "user_ids": [user_id for user_id, _ in requests],
+                "seat_numbers": [data.seat_number for _, data in requests],
+            },
+        )
+        rows = result.fetchall()
+        await self.session.commit()
+
+        results: list[Booking | DomainError] = []
+        for row, (user_id, data) in zip(rows, requests):
+            if row.error is not None:
+                results.append(DomainError(row.error))
+                continue
+            results.append(
+                Booking(
+                    id=row.booking_id,
+                    user_id=user_id,
+                    session_id=session_id,
+                    seat_number=data.seat_number,
+                    status="active",
+                    created_at=row.booked_at,
+                )
+            )
+        return results
+
     async def get_user_bookings(self, user_id: int) -> list[BookingDetailed]:
         query = text(
             """
@@ -90,15 +174,91 @@ class BookingRepository(IBookingRepository):
         row = result.fetchone()
         return Booking(**row._mapping)
 
-    async def get_all(self) -> list[Booking]:
+    async def _cancel_all(self, query, values: dict) -> list[Booking]:
+        try:
+            result = await self.session.execute(query, values)
+            rows = result.fetchall()
+            await self.session.commit()
+
+        except DBAPIError as e:
+            await self.session.rollback()
+            cause = getattr(e.orig, "__cause__", None)
+
+            if isinstance(cause, asyncpg.exceptions.RaiseError):
+                msg = str(cause).replace("ERROR:  ", "")
+                if msg.startswith("Session "):
+                    raise SessionNotFoundError(msg)
+                if msg.startswith("User "):
+                    raise UserNotFoundError(msg)
+                raise DomainError(msg)
+
+            raise
+
+        return [Booking(**row._mapping) for row in rows]
+
+    async def cancel_session_bookings(self, session_id: int) -> list[Booking]:
+        query = text(
+            """
+            SELECT *
+            FROM cancel_session_bookings(:session_id);
+        """
+        )
+        return await self._cancel_all(query, {"session_id": session_id})
+
+    async def cancel_user_bookings(self, user_id: int) -> list[Booking]:
+        query = text(
+            """
+            SELECT *
+            FROM cancel_user_bookings(:user_id);
+        """
+        )
+        return await self._cancel_all(query, {"user_id": user_id})
+
+    async def get_all(
+            self,
+            limit: int,
+            after: str | None = None,
+            session_id: int | None = None,
+            user_id: int | None = None,
+            status: str | None = None,
+    ) -> Page[Booking]:
+        condition, params = keyset_condition([("created_at", datetime), ("id", int)], after)
+        conditions = [condition]
+
+        if session_id is not None:
+            conditions.append("session_id = :session_id")
+            params["session_id"] = session_id
+        if user_id is not None:
+            conditions.append("user_id = :user_id")
+            params["user_id"] = user_id
+        if status is not None:
+            conditions.append("status = :status")
+            params["status"] = status
+        where = " AND ".join(conditions)
+
+        query = text(
+            f"""
+            SELECT id, user_id, session_id, seat_number, status, created_at
+            FROM bookings
+            WHERE {where}
+            ORDER BY created_at DESC, id DESC
+            LIMIT :limit
+        """
+        )
+        result = await self.session.execute(query, {**params, "limit": limit + 1})
+        rows, next_cursor = build_page(result.fetchall(), limit, lambda r: (r.created_at, r.id))
+        return Page[Booking](items=[Booking(**row._mapping) for row in rows], next_cursor=next_cursor)
+
+    async def get_session_bookings(self, session_id: int) -> list[Booking]:
         query = text(
             """
             SELECT id, user_id, session_id, seat_number, status, created_at
             FROM bookings
+            WHERE session_id = :session_id
             ORDER BY created_at DESC
         """
         )
-        result = await self.session.execute(query)
+        result = await self.session.execute(query, {"session_id": session_id})
         rows = result.fetchall()
         return [Booking(**row._mapping) for row in rows]
 
@@ -1,32 +1,81 @@
+import json
+
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Depends
+from database.catalog_versions import catalog_versions
 from database.db import get_session
 from domain.exceptions import FilmNotFound, FilmValidationError, FilmAlreadyExistsError
-from schemas.films import Film, NewFilm
+from schemas.films import Film, FilmFilters, FilmPage, NewFilm
+from schemas.pagination import Page
 from domain.interfaces.film_repository import IFilmRepository
 from schemas.sessions import Session
 import asyncpg
 from sqlalchemy.exc import DBAPIError
+from utils.pagination import keyset_condition, build_page
+
+IMPORT_COLUMNS = ("row_no", "title", "genre", "duration", "rating", "description")
 
 
 class FilmRepository(IFilmRepository):
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def get_all_films(self) -> list[Film]:
+    async def get_all_films(
+            self,
+            limit: int,
+            after: str | None = None,
+            filters: FilmFilters = FilmFilters(),
+    ) -> Page[Film]:
+        condition, params = keyset_condition([("rating", float), ("id", int)], after)
+        conditions = [condition]
+
+        if filters.genre:
+            conditions.append("genre = ANY(:genres)")
+            params["genres"] = [genre.value for genre in filters.genre]
+        if filters.is_active is not None:
+            conditions.append("is_active = :is_active")
+            params["is_active"] = filters.is_active
+        if filters.min_rating is not None:
+            conditions.append("rating >= :min_rating")
+            params["min_rating"] = filters.min_rating
+        if filters.max_duration is not None:
+            conditions.append("duration <= :max_duration")
+            params["max_duration"] = filters.max_duration
+        where = " AND ".join(conditions)
+
         query = text(
-            """
-            SELECT id, title, genre, duration, rating, description, image_url, is_active
+            f"""
+            SELECT id, title, genre, duration, rating, description, image_url, image_variants, is_active
             FROM films
-            ORDER BY rating DESC
+            WHERE {where}
+            ORDER BY rating DESC, id DESC
+            LIMIT :limit
             """
         )
-        result = await self.session.execute(query)
-        rows = result.fetchall()
-        return [Film(**row._mapping) for row in rows]
+        result = await self.session.execute(query, {**params, "limit": limit + 1})
+        rows, next_cursor = build_page(result.fetchall(), limit, lambda r: (r.rating, r.id))
+        return Page[Film](items=[Film(**row._mapping) for row in rows], next_cursor=next_cursor)
+
+    async def search(self, q: str, limit: int, offset: int) -> list[Film]:
+        query = text(
+            """
+            SELECT id, title, genre, duration, rating, description, image_url, image_variants, is_active
+            FROM films, websearch_to_tsquery('russian', :q) AS query
+            WHERE search_vector @@ query
+            ORDER BY ts_rank_cd(search_vector, query) DESC, id DESC
+            LIMIT :limit OFFSET :offset
+            """
+        )
+        result = await self.session.execute(query, {"q": q, "limit": limit, "offset": offset})
+        return [Film(**row._mapping) for row in result.fetchall()]
 
-    async def add_film(self, film: NewFilm, image_url: str | None = None) -> Film:
+    async def add_film(
+            self,
+            film: NewFilm,
+            image_url: str | None = None,
+            image_variants: dict | None = None,
+    ) -> Film:
         query = text(
             """
             SELECT * FROM add_film(
@@ -35,7 +84,8 @@ class FilmRepository(IFilmRepository):
                 :duration, 
                 :rating, 
                 :description, 
-                :image_url
+                :image_url,
+                CAST(:image_variants AS JSONB)
             );
             """
         )
@@ -46,13 +96,15 @@ class FilmRepository(IFilmRepository):
             "duration": film.duration,
             "rating": film.rating,
             "description": film.description,
-            "image_url": image_url
+            "image_url": image_url,
+            "image_variants": json.dumps(image_variants) if image_variants else None,
         }
 
         try:
             result = await self.session.execute(query, values)
             row = result.fetchone()
             await self.session.commit()
+            catalog_versions.touch("films")
 
             if not row:
                 raise FilmValidationError("Failed to create film")
@@ -84,11 +136,114 @@ class FilmRepository(IFilmRepository):
 
             raise FilmValidationError("Ошибка при создании фильма")
 
+    async def start_import(self) -> None:
+        await self.session.execute(
+            text(
+                """
+                CREATE TEMP TABLE film_import (
+                    row_no INT NOT NULL,
+                    title TEXT NOT NULL,
+                    genre TEXT NOT NULL,
+                    duration INT NOT NULL,
+                    rating FLOAT NOT NULL,
+                    description TEXT
+                ) ON COMMIT DROP
+                """
+            )
+        )
+
+    async def copy_import_rows(self, records: list[tuple]) -> None:
+        connection = await self.session.connection()
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            "film_import", records=records, columns=IMPORT_COLUMNS
+        )
+
+    async def reject_import_rows(self, limit: int, upsert: bool = False) -> tuple[int, list[tuple[int, str]]]:
+        # Те же проверки, что в add_film: строки с ошибкой убираются из слияния.
+        # Названия не уникальны, поэтому при upsert строка, чьё название носят
+        # несколько фильмов, отклоняется, а не обновляет их все.
+        result = await self.session.execute(
+            text(
+                """
+                WITH rejected AS (
+                    DELETE FROM film_import i
+                    WHERE film_error(i.title, i.genre, i.duration, i.rating) IS NOT NULL
+                       OR (:upsert AND (SELECT COUNT(*) FROM films f WHERE f.title = i.title) > 1)
+                    RETURNING i.row_no, COALESCE(
+                        film_error(i.title, i.genre, i.duration, i.rating),
+                        'Title matches several films'
+                    ) AS error
+                )
+                SELECT total.count AS total, r.row_no, r.error
+                FROM (SELECT COUNT(*) FROM rejected) AS total
+                LEFT JOIN LATERAL (
+                    SELECT row_no, error FROM rejected ORDER BY row_no LIMIT :limit
+                ) AS r ON TRUE
+                """
+            ),
+            {"limit": limit, "upsert": upsert},
+        )
+        rows = result.fetchall()
+        return rows[0].total, [(row.row_no, row.error) for row in rows if row.row_no is not None]
+
+    async def finish_import(self, upsert: bool = False) -> tuple[int, int]:
+        if upsert:
+            # Повтор названия в одном файле — побеждает последняя строка; фильм с тем
+            # же названием (после reject_import_rows он единственный) обновляется.
+            query = """
+                WITH latest AS (
+                    SELECT DISTINCT ON (title) title, genre, duration, rating, description
+                    FROM film_import
+                    ORDER BY title, row_no DESC
+                ),
+                updated AS (
+                    UPDATE films f
+                    SET genre = l.genre,
+                        duration = l.duration,
+                        rating = l.rating,
+                        description = l.description
+                    FROM latest l
+                    WHERE f.title = l.title
+                    RETURNING f.id
+                ),
+                inserted AS (
+                    INSERT INTO films (title, genre, duration, rating, description)
+                    SELECT l.title, l.genre, l.duration, l.rating, l.description
+                    FROM latest l
+                    WHERE NOT EXISTS (SELECT 1 FROM films f WHERE f.title = l.title)
+                    RETURNING id
+                )
+                SELECT
+                    (SELECT COUNT(*) FROM inserted) AS inserted,
+                    (SELECT COUNT(*) FROM updated) AS updated
+            """
+        else:
+            # По умолчанию только вставка: каждая строка файла — новый фильм.
+            query = """
+                WITH inserted AS (
+                    INSERT INTO films (title, genre, duration, rating, description)
+                    SELECT title, genre, duration, rating, description
+                    FROM film_import
+                    ORDER BY row_no
+                    RETURNING id
+                )
+                SELECT (SELECT COUNT(*) FROM inserted) AS inserted, 0 AS updated
+            """
+        result = await self.session.execute(text(query))
+        row = result.fetchone()
+        await self.session.commit()
+        catalog_versions.touch("films")
+        return row.inserted, row.updated
+
+    async def abort_import(self) -> None:
+        await self.session.rollback()
+
     async def get_by_id(self, id: int) -> Film | None:
         result = await self.session.execute(
             text(
                 """
-                SELECT id, title, genre, duration, rating, description, image_url, is_active
+                SELECT id, title, genre, duration, rating, description, image_url, image_variants, is_active
                 FROM films
                 WHERE id = :id
                 """
@@ -107,7 +262,8 @@ class FilmRepository(IFilmRepository):
             film_id: int,
             film_data: NewFilm,
             image_url: str | None = None,
-            is_active: bool = True
+            is_active: bool = True,
+            image_variants: dict | None = None,
     ) -> Film:
         query = text(
             """
@@ -119,7 +275,8 @@ class FilmRepository(IFilmRepository):
                 :rating,
                 :description,
                 :is_active,
-                :image_url
+                :image_url,
+                CAST(:image_variants AS JSONB)
             );
             """
         )
@@ -132,13 +289,15 @@ class FilmRepository(IFilmRepository):
             "rating": film_data.rating,
             "description": film_data.description,
             "is_active": is_active,
-            "image_url": image_url
+            "image_url": image_url,
+            "image_variants": json.dumps(image_variants) if image_variants else None,
         }
 
         try:
             result = await self.session.execute(query, values)
             row = result.fetchone()
             await self.session.commit()
+            catalog_versions.touch("films")
 
             if not row:
                 raise FilmNotFound(f"Film {film_id} not found")
@@ -174,6 +333,41 @@ class FilmRepository(IFilmRepository):
             {"id": id},
         )
         await self.session.commit()
+        catalog_versions.touch("films")
+        catalog_versions.touch("sessions")
+
+    async def get_page(self, film_id: int) -> FilmPage | None:
+        result = await self.session.execute(
+            text(
+                """
+                SELECT
+                    f.id, f.title, f.genre, f.duration, f.rating, f.description, f.image_url, f.image_variants,
+                    f.is_active,
+                    COALESCE(
+                        jsonb_agg(
+                            to_jsonb(s) || jsonb_build_object('hall_name', h.name)
+                            ORDER BY s.start_time
+                        ) FILTER (WHERE s.id IS NOT NULL),
+                        '[]'::jsonb
+                    ) AS sessions
+                FROM films f
+                LEFT JOIN sessions s ON s.film_id = f.id AND s.start_time > NOW()
+                LEFT JOIN halls h ON h.id = s.hall_id
+                WHERE f.id = :id
+                GROUP BY f.id
+                """
+            ),
+            {"id": film_id},
+        )
+        row = result.fetchone()
+        if row is None:
+            return None
+
+        film = dict(row._mapping)
+        sessions = film.pop("sessions")
+        if isinstance(sessions, str):
+            sessions = json.loads(sessions)
+        return FilmPage(film=Film(**film), sessions=sessions)
 
     async def get_sessions_by_film_id(self, film_id: int) -> list[Session]:
         query = text("""
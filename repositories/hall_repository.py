@@ -6,8 +6,11 @@ from sqlalchemy.exc import DBAPIError
 
 from domain.exceptions import HallNotFound, HallValidationError, HallAlreadyExistsError, HallHasFutureSessionsError
 from domain.interfaces.hall_repository import IHallRepository
+from database.catalog_versions import catalog_versions
 from database.db import get_session
 from schemas.halls import HallCreate, Hall
+from schemas.pagination import Page
+from utils.pagination import keyset_condition, build_page
 
 
 class HallRepository(IHallRepository):
@@ -30,6 +33,7 @@ class HallRepository(IHallRepository):
             result = await self.session.execute(query, values)
             row = result.fetchone()
             await self.session.commit()
+            catalog_versions.touch("halls")
 
             if not row:
                 raise HallValidationError("Failed to create hall")
@@ -54,19 +58,22 @@ class HallRepository(IHallRepository):
 
             raise HallValidationError("Ошибка при создании зала")
 
-    async def get_all_halls(self) -> list[Hall]:
+    async def get_all_halls(self, limit: int, after: str | None = None) -> Page[Hall]:
+        condition, params = keyset_condition([("name", str), ("id", int)], after, descending=False)
         query = text(
-            """
+            f"""
             SELECT id, name, capacity
             FROM halls
-            ORDER BY name
+            WHERE {condition}
+            ORDER BY name, id
+            LIMIT :limit
             """
         )
 
-        result = await self.session.execute(query)
-        rows = result.fetchall()
+        result = await self.session.execute(query, {**params, "limit": limit + 1})
+        rows, next_cursor = build_page(result.fetchall(), limit, lambda r: (r.name, r.id))
 
-        return [Hall(**row._mapping) for row in rows]
+        return Page[Hall](items=[Hall(**row._mapping) for row in rows], next_cursor=next_cursor)
 
     async def delete_hall(self, id: int) -> None:
         query = text("SELECT delete_hall(:hall_id);")
@@ -77,6 +84,8 @@ class HallRepository(IHallRepository):
                 {"hall_id": id}
             )
             await self.session.commit()
+            catalog_versions.touch("halls")
+            catalog_versions.touch("sessions")
 
         except DBAPIError as e:
             await self.session.rollback()
@@ -0,0 +1,95 @@
+import json
+from uuid import UUID
+
+import asyncpg
+from fastapi import Depends
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.db import get_session
+from domain.exceptions import DomainError, HoldNotFoundError, SeatsUnavailableError
+from domain.interfaces.hold_repository import IHoldRepository
+from schemas.bookings import Booking
+from schemas.holds import NewSeatHold, SeatHold
+
+
+def _to_hold(rows) -> SeatHold:
+    first = rows[0]
+    return SeatHold(
+        hold_id=first.hold_id,
+        session_id=first.session_id,
+        user_id=first.user_id,
+        seat_numbers=sorted(row.seat_number for row in rows),
+        expires_at=first.expires_at,
+    )
+
+
+class HoldRepository(IHoldRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def _execute(self, query, values: dict) -> list:
+        try:
+            result = await self.session.execute(query, values)
+            rows = result.fetchall()
+            await self.session.commit()
+            return rows
+
+        except DBAPIError as e:
+            await self.session.rollback()
+            cause = getattr(e.orig, "__cause__", None)
+
+            if isinstance(cause, asyncpg.exceptions.RaiseError):
+                msg = str(cause).replace("ERROR:  ", "")
+                if cause.detail:
+                    raise SeatsUnavailableError(msg, json.loads(cause.detail))
+                if msg.startswith("Hold "):
+                    raise HoldNotFoundError(msg)
+                raise DomainError(msg)
+
+            raise
+
+    async def hold(self, user_id: int, data: NewSeatHold) -> SeatHold:
+        query = text(
+            """
+            SELECT *
+            FROM hold_seats(:user_id, :session_id, :seat_numbers, :ttl_seconds);
+            """
+        )
+        rows = await self._execute(
+            query,
+            {
+                "user_id": user_id,
+                "session_id": data.session_id,
+                "seat_numbers": data.seat_numbers,
+                "ttl_seconds": data.ttl_seconds,
+            },
+        )
+        return _to_hold(rows)
+
+    async def confirm(self, hold_id: UUID, user_id: int) -> list[Booking]:
+        query = text(
+            """
+            SELECT *
+            FROM confirm_hold(:hold_id, :user_id);
+            """
+        )
+        rows = await self._execute(query, {"hold_id": hold_id, "user_id": user_id})
+        return [Booking(**row._mapping) for row in rows]
+
+    async def release(self, hold_id: UUID, user_id: int) -> SeatHold:
+        query = text(
+            """
+            SELECT *
+            FROM release_hold(:hold_id, :user_id);
+            """
+        )
+        rows = await self._execute(query, {"hold_id": hold_id, "user_id": user_id})
+        return _to_hold(rows)
+
+
+async def get_hold_repo(
+        session: AsyncSession = Depends(get_session),
+) -> HoldRepository:
+    return HoldRepository(session)
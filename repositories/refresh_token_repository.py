@@ -0,0 +1,53 @@
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import Depends
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.db import get_session
+from domain.interfaces.refresh_token_repository import IRefreshTokenRepository
+from schemas.users import User
+
+
+class RefreshTokenRepository(IRefreshTokenRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def issue(self, jti: UUID, family: UUID, user_id: int, expires_at: datetime) -> None:
+        await self.session.execute(
+            text("SELECT issue_refresh_token(:jti, :family, :user_id, :expires_at)"),
+            {"jti": jti, "family": family, "user_id": user_id, "expires_at": expires_at},
+        )
+        await self.session.commit()
+
+    async def rotate(self, jti: UUID, new_jti: UUID, expires_at: datetime) -> User | None:
+        result = await self.session.execute(
+            text("SELECT * FROM rotate_refresh_token(:jti, :new_jti, :expires_at)"),
+            {"jti": jti, "new_jti": new_jti, "expires_at": expires_at},
+        )
+        row = result.fetchone()
+        await self.session.commit()
+        if row is None:
+            return None
+        return User(**row._mapping)
+
+    async def revoke_family(self, jti: UUID) -> None:
+        await self.session.execute(
+            text("SELECT revoke_refresh_token_family(:jti)"),
+            {"jti": jti},
+        )
+        await self.session.commit()
+
+    async def revoke_user(self, user_id: int) -> None:
+        await self.session.execute(
+            text("DELETE FROM refresh_tokens WHERE user_id = :user_id"),
+            {"user_id": user_id},
+        )
+        await self.session.commit()
+
+
+async def get_refresh_token_repo(
+        session: AsyncSession = Depends(get_session),
+) -> IRefreshTokenRepository:
+    return RefreshTokenRepository(session)
@@ -0,0 +1,86 @@
+from fastapi import Depends
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.db import get_session
+from domain.interfaces.s3_outbox_repository import IS3OutboxRepository
+
+
+class S3OutboxRepository(IS3OutboxRepository):
+    """
+    Очередь удалений объектов S3. Строки добавляет триггер на films в той же
+    транзакции, что и изменение фильма. claim и complete/retry_later воркер коммитит
+    отдельными транзакциями, удаление из S3 идёт между ними. Ключи, на которые ещё
+    ссылается какой-либо фильм, claim снимает с очереди, а ключи закреплённых
+    загрузкой стемов откладывает до конца закрепления (см. claim_s3_deletes).
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def enqueue(self, keys: list[str]) -> None:
+        await self.session.execute(
+            text("INSERT INTO s3_delete_outbox (object_key) SELECT unnest(CAST(:keys AS TEXT[]))"),
+            {"keys": keys},
+        )
+        await self.session.commit()
+
+    async def claim(self, limit: int, claim_seconds: float) -> list[tuple[int, str, int]]:
+        result = await self.session.execute(
+            text("SELECT job_id, job_key, job_attempts FROM claim_s3_deletes(:limit, :claim_seconds)"),
+            {"limit": limit, "claim_seconds": claim_seconds},
+        )
+        return [(row.job_id, row.job_key, row.job_attempts) for row in result.fetchall()]
+
+    async def pin(self, stem: str, pin_seconds: float) -> int:
+        result = await self.session.execute(
+            text("SELECT pin_poster(:stem, :pin_seconds)"),
+            {"stem": stem, "pin_seconds": pin_seconds},
+        )
+        pin_id = result.scalar_one()
+        await self.session.commit()
+        return pin_id
+
+    async def unpin(self, pin_id: int) -> None:
+        await self.session.execute(
+            text("DELETE FROM poster_pins WHERE id = :id"),
+            {"id": pin_id},
+        )
+        await self.session.commit()
+
+    async def delete_in_flight(self, stem: str) -> bool:
+        result = await self.session.execute(
+            text("SELECT poster_delete_in_flight(:stem)"),
+            {"stem": stem},
+        )
+        in_flight = result.scalar_one()
+        # Не держим снимок открытым между опросами.
+        await self.session.commit()
+        return in_flight
+
+    async def complete(self, ids: list[int]) -> None:
+        await self.session.execute(
+            text("DELETE FROM s3_delete_outbox WHERE id = ANY(:ids)"),
+            {"ids": ids},
+        )
+
+    async def retry_later(self, id: int, error: str, delay_seconds: float) -> None:
+        await self.session.execute(
+            text(
+                """
+                UPDATE s3_delete_outbox
+                SET attempts = attempts + 1,
+                    last_error = :error,
+                    next_attempt_at = NOW() + make_interval(secs => :delay),
+                    claimed_until = NULL
+                WHERE id = :id
+                """
+            ),
+            {"id": id, "error": error[:1000], "delay": delay_seconds},
+        )
+
+
+async def get_s3_outbox_repo(
+        session: AsyncSession = Depends(get_session),
+) -> IS3OutboxRepository:
+    return S3OutboxRepository(session)
@@ -1,9 +1,20 @@
+import asyncio
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import BinaryIO
+
 import aioboto3
+from aiobotocore.config import AioConfig
+from botocore.exceptions import ClientError
 from core.config import settings
 from domain.interfaces.s3_repository import IS3Repository
 
 
 class S3Repository(IS3Repository):
+    """
+    Клиент S3 открывается один раз в start() и переиспользуется всеми запросами
+    вместе с пулом соединений. До start() каждый вызов открывает свой клиент.
+    """
+
     def __init__(
         self,
         endpoint_url: str = settings.s3.endpoint_url,
@@ -11,39 +22,144 @@ class S3Repository(IS3Repository):
         secret_key: str = settings.s3.secret_key,
         region: str = settings.s3.region,
         bucket_name: str = settings.s3.bucket_name,
+        multipart_threshold_bytes: int = settings.s3.multipart_threshold_bytes,
+        multipart_part_bytes: int = settings.s3.multipart_part_bytes,
+        max_pool_connections: int = settings.s3.max_pool_connections,
     ):
         self.endpoint_url = endpoint_url
         self.access_key = access_key
         self.secret_key = secret_key
         self.region = region
         self.bucket_name = bucket_name
+        self.multipart_threshold_bytes = multipart_threshold_bytes
+        self.multipart_part_bytes = multipart_part_bytes
+        self.max_pool_connections = max_pool_connections
         self.session = aioboto3.Session()
+        self._stack: AsyncExitStack | None = None
+        self._shared = None
 
-    async def _client(self):
+    def _new_client(self):
         return self.session.client(
             "s3",
             region_name=self.region,
             endpoint_url=self.endpoint_url,
             aws_access_key_id=self.access_key,
             aws_secret_access_key=self.secret_key,
+            config=AioConfig(max_pool_connections=self.max_pool_connections),
         )
 
-    async def upload_file(self, image: bytes, key: str):
-        async with await self._client() as s3:
+    @asynccontextmanager
+    async def _client(self):
+        if self._shared is not None:
+            yield self._shared
+            return
+        async with self._new_client() as s3:
+            yield s3
+
+    async def start(self) -> None:
+        if self._shared is None:
+            self._stack = AsyncExitStack()
+            self._shared = await self._stack.enter_async_context(self._new_client())
+
+    async def close(self) -> None:
+        if self._stack is not None:
+            self._shared = None
+            await self._stack.aclose()
+            self._stack = None
+
+    @staticmethod
+    def _extra(content_type: str | None, cache_control: str | None) -> dict:
+        extra = {}
+        if content_type:
+            extra["ContentType"] = content_type
+        if cache_control:
+            extra["CacheControl"] = cache_control
+        return extra
+
+    def url_for(self, key: str) -> str:
+        return f"{settings.s3.public_url}/{key}"
+
+    async def exists(self, key: str) -> bool:
+        async with self._client() as s3:
+            try:
+                await s3.head_object(Bucket=self.bucket_name, Key=key)
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                    return False
+                raise
+        return True
+
+    async def upload_file(
+        self,
+        image: bytes,
+        key: str,
+        content_type: str | None = None,
+        cache_control: str | None = None,
+    ):
+        async with self._client() as s3:
             await s3.put_object(
                 Bucket=self.bucket_name,
                 Key=key,
                 Body=image,
+                **self._extra(content_type, cache_control),
             )
-        return f"{settings.s3.public_url}/{key}"
+        return self.url_for(key)
+
+    async def upload_fileobj(
+        self,
+        fileobj: BinaryIO,
+        key: str,
+        size: int,
+        content_type: str | None = None,
+        cache_control: str | None = None,
+    ):
+        """
+        Загрузка из файла без чтения его в память целиком: небольшие файлы одним
+        put_object, крупные — multipart по multipart_part_bytes за раз.
+        """
+        if size <= self.multipart_threshold_bytes:
+            return await self.upload_file(
+                await asyncio.to_thread(fileobj.read), key, content_type, cache_control
+            )
+
+        async with self._client() as s3:
+            upload = await s3.create_multipart_upload(
+                Bucket=self.bucket_name, Key=key, **self._extra(content_type, cache_control)
+            )
+            upload_id = upload["UploadId"]
+            parts = []
+            try:
+                while part := await asyncio.to_thread(fileobj.read, self.multipart_part_bytes):
+                    number = len(parts) + 1
+                    result = await s3.upload_part(
+                        Bucket=self.bucket_name,
+                        Key=key,
+                        UploadId=upload_id,
+                        PartNumber=number,
+                        Body=part,
+                    )
+                    parts.append({"PartNumber": number, "ETag": result["ETag"]})
+                await s3.complete_multipart_upload(
+                    Bucket=self.bucket_name,
+                    Key=key,
+                    UploadId=upload_id,
+                    MultipartUpload={"Parts": parts},
+                )
+            except BaseException:
+                await s3.abort_multipart_upload(Bucket=self.bucket_name, Key=key, UploadId=upload_id)
+                raise
+        return self.url_for(key)
 
     async def delete(self, key: str) -> None:
-        async with await self._client() as s3:
+        async with self._client() as s3:
             await s3.delete_object(
                 Bucket=self.bucket_name,
                 Key=key,
             )
 
 
+s3_repository = S3Repository()
+
+
 def get_s3_repo():
-    return S3Repository()
+    return s3_repository
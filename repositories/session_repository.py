@@ -5,9 +5,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import DBAPIError
 import asyncpg
 from domain.exceptions import FilmNotFound, HallNotFound
+from database.catalog_versions import catalog_versions
 from database.db import get_session
 from domain.interfaces.session_repository import ISessionRepository
+from schemas.holds import SeatHold
 from schemas.sessions import Session, NewSession
+from schemas.pagination import Page
+from utils.pagination import Timestamptz, keyset_condition, build_page
 
 
 class SessionRepository(ISessionRepository):
@@ -42,6 +46,7 @@ class SessionRepository(ISessionRepository):
         try:
             result = await self.session.execute(query, data.model_dump())
             await self.session.commit()
+            catalog_versions.touch("sessions")
 
         except DBAPIError as e:
             cause = getattr(e.orig, "__cause__", None)
@@ -58,10 +63,72 @@ class SessionRepository(ISessionRepository):
 
         return Session(**row._mapping)
 
-    async def get_all_sessions(self) -> list[Session]:
-        query = text("SELECT * FROM sessions ORDER BY start_time DESC")
-        result = await self.session.execute(query)
-        return [Session(**row._mapping) for row in result.fetchall()]
+    async def get_all_sessions(
+            self,
+            limit: int,
+            after: str | None = None,
+            film_id: int | None = None,
+            hall_id: int | None = None,
+    ) -> Page[Session]:
+        condition, params = keyset_condition([("start_time", Timestamptz), ("id", int)], after)
+        conditions = [condition]
+
+        if film_id is not None:
+            conditions.append("film_id = :film_id")
+            params["film_id"] = film_id
+        if hall_id is not None:
+            conditions.append("hall_id = :hall_id")
+            params["hall_id"] = hall_id
+        where = " AND ".join(conditions)
+
+        query = text(
+            f"""
+            SELECT *
+            FROM sessions
+            WHERE {where}
+            ORDER BY start_time DESC, id DESC
+            LIMIT :limit
+            """
+        )
+        result = await self.session.execute(query, {**params, "limit": limit + 1})
+        rows, next_cursor = build_page(result.fetchall(), limit, lambda r: (r.start_time, r.id))
+        return Page[Session](items=[Session(**row._mapping) for row in rows], next_cursor=next_cursor)
+
+    async def get_seat_state(self, session_id: int) -> tuple[int, list[int]] | None:
+        query = text(
+            """
+            SELECT
+                s.total_seats,
+                ARRAY(
+                    SELECT b.seat_number
+                    FROM bookings b
+                    WHERE b.session_id = s.id AND b.status = 'active'
+                ) AS booked_seats
+            FROM sessions s
+            WHERE s.id = :session_id
+            """
+        )
+        result = await self.session.execute(query, {"session_id": session_id})
+        row = result.fetchone()
+        if row is None:
+            return None
+        return row.total_seats, list(row.booked_seats)
+
+    async def get_session_holds(self, session_id: int) -> list[SeatHold]:
+        query = text(
+            """
+            SELECT hold_id, user_id, array_agg(seat_number ORDER BY seat_number) AS seat_numbers,
+                   MAX(expires_at) AS expires_at
+            FROM seat_holds
+            WHERE session_id = :session_id AND expires_at > NOW()
+            GROUP BY hold_id, user_id
+            """
+        )
+        result = await self.session.execute(query, {"session_id": session_id})
+        return [
+            SeatHold(session_id=session_id, **row._mapping)
+            for row in result.fetchall()
+        ]
 
     async def delete_session(self, session_id: int) -> None:
         query = text("SELECT delete_session(:session_id);")
@@ -72,6 +139,7 @@ class SessionRepository(ISessionRepository):
                 {"session_id": session_id}
             )
             await self.session.commit()
+            catalog_versions.touch("sessions")
 
         except DBAPIError as e:
             cause = getattr(e.orig, "__cause__", None)
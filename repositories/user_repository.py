@@ -6,6 +6,7 @@ from sqlalchemy.exc import IntegrityError
 import asyncpg
 from sqlalchemy.exc import DBAPIError
 
+from database.catalog_versions import catalog_versions
 from database.db import get_session
 from domain.exceptions import UserAlreadyExistsError, UserValidationError
 from domain.interfaces.user_repository import IUserRepository
@@ -89,6 +90,25 @@ class UserRepository(IUserRepository):
             return None
         return User(**row._mapping)
 
+    async def update_password_hash(self, user_id: int, password_hash: bytes) -> None:
+        await self.session.execute(
+            text("UPDATE users SET password_hash = :password_hash WHERE id = :id"),
+            {"id": user_id, "password_hash": password_hash},
+        )
+        await self.session.commit()
+
+    async def set_role(self, user_id: int, role: str) -> User | None:
+        result = await self.session.execute(
+            text("UPDATE users SET role = :role WHERE id = :id RETURNING id, name, email, role"),
+            {"id": user_id, "role": role},
+        )
+        row = result.fetchone()
+        await self.session.commit()
+        catalog_versions.touch("users")
+        if row is None:
+            return None
+        return User(**row._mapping)
+
 
 async def get_user_repo(
         session: AsyncSession = Depends(get_session),
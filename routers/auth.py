@@ -1,8 +1,10 @@
 from fastapi import APIRouter, Depends, Form, HTTPException
 from pydantic import EmailStr
-from domain.exceptions import InvalidCredentialsError, UserAlreadyExistsError, UserValidationError
-from schemas.token import Token
-from schemas.users import UserRegistration
+from core.auth import admin_required
+from domain.exceptions import InvalidCredentialsError, UserAlreadyExistsError, UserValidationError, UserNotFoundError, \
+    PasswordHasherBusyError, InvalidRefreshTokenError
+from schemas.token import RefreshRequest, Token
+from schemas.users import RoleUpdate, User, UserRegistration
 from services.user_service import UserService, get_user_service
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
@@ -22,6 +24,9 @@ async def registration(
     except UserValidationError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+    except PasswordHasherBusyError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
+
     except Exception as e:
         raise HTTPException(status_code=500, detail="Internal server error")
 
@@ -35,4 +40,40 @@ async def login(
     try:
         return await service.login(email, password)
     except InvalidCredentialsError:
-        raise HTTPException(status_code=401, detail="Invalid credentials")
\ No newline at end of file
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    except PasswordHasherBusyError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
+
+
+@router.post("/refresh", response_model=Token)
+async def refresh(
+        data: RefreshRequest,
+        service: UserService = Depends(get_user_service),
+):
+    try:
+        return await service.refresh(data.refresh_token)
+    except InvalidRefreshTokenError as e:
+        raise HTTPException(status_code=401, detail=str(e))
+
+
+@router.post("/logout", status_code=204)
+async def logout(
+        data: RefreshRequest,
+        service: UserService = Depends(get_user_service),
+):
+    try:
+        await service.logout(data.refresh_token)
+    except InvalidRefreshTokenError as e:
+        raise HTTPException(status_code=401, detail=str(e))
+
+
+@router.put("/users/{user_id}/role", response_model=User, dependencies=[Depends(admin_required)])
+async def set_user_role(
+        user_id: int,
+        data: RoleUpdate,
+        service: UserService = Depends(get_user_service),
+):
+    try:
+        return await service.set_role(user_id, data.role)
+    except UserNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
@@ -1,21 +1,49 @@
-from fastapi import APIRouter, Depends
-from schemas.bookings import Booking, NewBooking, BookingDetailed
+from fastapi import APIRouter, Depends, Header
+from schemas.bookings import Booking, NewBooking, BookingDetailed, NewBookingBatch, BulkCancelResult
 from services.booking_service import BookingService, get_booking_service
 from core.auth import get_current_user_id, admin_required
-from domain.exceptions import DomainError
+from domain.exceptions import DomainError, SeatsUnavailableError, InvalidCursorError, SessionNotFoundError, \
+    UserNotFoundError, IdempotencyKeyMismatchError
+from schemas.pagination import Page
+from utils.pagination import PageParams, get_page_params
 from fastapi import HTTPException
 
 router = APIRouter(prefix="/bookings", tags=["Bookings"])
 
+IdempotencyKey = Header(None, alias="Idempotency-Key", max_length=255)
+
 
 @router.post("/", response_model=Booking)
 async def create_booking(
     data: NewBooking,
     user_id: int = Depends(get_current_user_id),
+    idempotency_key: str | None = IdempotencyKey,
+    service: BookingService = Depends(get_booking_service),
+):
+    try:
+        return await service.create(user_id, data, idempotency_key)
+    except IdempotencyKeyMismatchError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except DomainError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.post("/batch", response_model=list[Booking])
+async def create_bookings_batch(
+    data: NewBookingBatch,
+    user_id: int = Depends(get_current_user_id),
+    idempotency_key: str | None = IdempotencyKey,
     service: BookingService = Depends(get_booking_service),
 ):
     try:
-        return await service.create(user_id, data)
+        return await service.create_many(user_id, data, idempotency_key)
+    except IdempotencyKeyMismatchError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except SeatsUnavailableError as e:
+        raise HTTPException(
+            status_code=409,
+            detail={"message": str(e), "conflicts": e.conflicts},
+        )
     except DomainError as e:
         raise HTTPException(status_code=409, detail=str(e))
 
@@ -32,19 +60,63 @@ async def get_my_bookings(
 async def cancel_booking(
     booking_id: int,
     user_id: int = Depends(get_current_user_id),
+    idempotency_key: str | None = IdempotencyKey,
+    service: BookingService = Depends(get_booking_service),
+):
+    try:
+        return await service.cancel(booking_id, user_id, idempotency_key)
+    except IdempotencyKeyMismatchError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except DomainError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.put(
+    "/sessions/{session_id}/cancel",
+    response_model=BulkCancelResult,
+    dependencies=[Depends(admin_required)],
+)
+async def cancel_session_bookings(
+    session_id: int,
+    service: BookingService = Depends(get_booking_service),
+):
+    try:
+        return await service.cancel_session(session_id)
+    except SessionNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except DomainError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.put(
+    "/users/{user_id}/cancel",
+    response_model=BulkCancelResult,
+    dependencies=[Depends(admin_required)],
+)
+async def cancel_user_bookings(
+    user_id: int,
     service: BookingService = Depends(get_booking_service),
 ):
     try:
-        return await service.cancel(booking_id, user_id)
+        return await service.cancel_user(user_id)
+    except UserNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except DomainError as e:
         raise HTTPException(status_code=409, detail=str(e))
 
 
-@router.get("/", response_model=list[Booking], dependencies=[Depends(admin_required)])
+@router.get("/", response_model=Page[Booking], dependencies=[Depends(admin_required)])
 async def get_all_bookings(
+    session_id: int | None = None,
+    user_id: int | None = None,
+    status: str | None = None,
+    page: PageParams = Depends(get_page_params),
     service: BookingService = Depends(get_booking_service),
 ):
-    return await service.get_all()
+    try:
+        return await service.get_all(page.limit, page.after, session_id, user_id, status)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/{id}/bookings")
 async def get_session_bookings(
@@ -52,8 +124,6 @@ async def get_session_bookings(
     service: BookingService = Depends(get_booking_service)
 ):
     try:
-        all_bookings = await service.get_all()
-        session_bookings = [booking for booking in all_bookings if booking.session_id == id]
-        return session_bookings
+        return await service.get_by_session(id)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
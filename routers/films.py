@@ -1,16 +1,50 @@
-from fastapi import APIRouter, Depends, Form, File, UploadFile, status, HTTPException
+from fastapi import APIRouter, Depends, Form, File, UploadFile, status, HTTPException, Query, Request
 
 from core.auth import admin_required
-from domain.exceptions import FilmNotFound, FilmAlreadyExistsError, FilmValidationError
+from domain.exceptions import FilmNotFound, FilmAlreadyExistsError, FilmValidationError, InvalidCursorError, \
+    FilmImportFormatError
 from services.film_service import FilmService, get_film_service
-from schemas.films import Film, NewFilm
+from schemas.films import Film, FilmFilters, FilmGenre, FilmImportResult, FilmPage, NewFilm
+from schemas.pagination import Page
+from utils.etag import catalog_etag
+from utils.pagination import DEFAULT_LIMIT, MAX_LIMIT, PageParams, get_page_params
 
 router = APIRouter(prefix="/films", tags=["Films"])
 
 
-@router.get("/", response_model=list[Film])
-async def get_films(service: FilmService = Depends(get_film_service)) -> list[Film]:
-    return await service.get_all()
+def get_film_filters(
+        genre: list[FilmGenre] | None = Query(None),
+        is_active: bool | None = None,
+        min_rating: float | None = Query(None, ge=0, le=10),
+        max_duration: int | None = Query(None, ge=0),
+) -> FilmFilters:
+    return FilmFilters(
+        genre=tuple(sorted(set(genre))) if genre else None,
+        is_active=is_active,
+        min_rating=min_rating,
+        max_duration=max_duration,
+    )
+
+
+@router.get("/", response_model=Page[Film], dependencies=[Depends(catalog_etag("films"))])
+async def get_films(
+        page: PageParams = Depends(get_page_params),
+        filters: FilmFilters = Depends(get_film_filters),
+        service: FilmService = Depends(get_film_service),
+) -> Page[Film]:
+    try:
+        return await service.get_all(page.limit, page.after, filters)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/search", response_model=list[Film], dependencies=[Depends(catalog_etag("films"))])
+async def search_films(
+        q: str = Query(..., min_length=1, max_length=200),
+        limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+        offset: int = Query(0, ge=0),
+        service: FilmService = Depends(get_film_service),
+) -> list[Film]:
+    return await service.search(q, limit, offset)
 
 @router.get("/{id}", response_model=Film)
 async def get_film(id: int, service: FilmService = Depends(get_film_service)) -> Film:
@@ -93,6 +127,22 @@ async def add_film(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.post("/import", response_model=FilmImportResult, dependencies=[Depends(admin_required)])
+async def import_films(
+        request: Request,
+        format: str | None = Query(None, description="ndjson или csv; по умолчанию из Content-Type"),
+        upsert: bool = Query(False, description="обновлять фильм с тем же названием вместо вставки"),
+        service: FilmService = Depends(get_film_service),
+):
+    if format is None:
+        content_type = request.headers.get("content-type", "")
+        format = "csv" if "csv" in content_type else "ndjson"
+    try:
+        return await service.import_films(request.stream(), format, upsert)
+    except FilmImportFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.delete(
     "/{id}",
     status_code=status.HTTP_204_NO_CONTENT,
@@ -105,6 +155,21 @@ async def delete_film(id: int, service: FilmService = Depends(get_film_service))
         raise HTTPException(status_code=404, detail="Film not found")
 
 
+@router.get(
+    "/{id}/page",
+    response_model=FilmPage,
+    dependencies=[Depends(catalog_etag("films", "sessions", volatile=True))],
+)
+async def get_film_page(
+    id: int,
+    service: FilmService = Depends(get_film_service),
+):
+    try:
+        return await service.get_page(id)
+    except FilmNotFound:
+        raise HTTPException(status_code=404, detail="Film not found")
+
+
 @router.get("/{id}/sessions")
 async def get_sessions(
     id: int,
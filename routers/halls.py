@@ -1,9 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException
 
 from core.auth import admin_required
-from domain.exceptions import HallNotFound, HallValidationError, HallAlreadyExistsError, HallHasFutureSessionsError
+from domain.exceptions import HallNotFound, HallValidationError, HallAlreadyExistsError, HallHasFutureSessionsError, \
+    InvalidCursorError
 from repositories.hall_repository import HallRepository, get_hall_repository
 from schemas.halls import HallCreate, Hall
+from schemas.pagination import Page
+from utils.etag import catalog_etag
+from utils.pagination import PageParams, get_page_params
 
 router = APIRouter(prefix="/halls", tags=["Halls"])
 
@@ -25,11 +29,16 @@ async def add_hall(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-@router.get("/", response_model=list[Hall])
+@router.get("/", response_model=Page[Hall], dependencies=[Depends(catalog_etag("halls"))])
 async def get_halls(
+        page: PageParams = Depends(get_page_params),
         repository: HallRepository = Depends(get_hall_repository),
-) -> list[Hall]:
-    return await repository.get_all_halls()
+) -> Page[Hall]:
+    try:
+        return await repository.get_all_halls(page.limit, page.after)
+
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.delete("/{id}", status_code=204, dependencies=[Depends(admin_required)])
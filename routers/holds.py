@@ -0,0 +1,59 @@
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from core.auth import get_current_user_id
+from domain.exceptions import DomainError, HoldNotFoundError, SeatsUnavailableError
+from schemas.bookings import Booking
+from schemas.holds import NewSeatHold, SeatHold
+from services.hold_service import HoldService, get_hold_service
+
+router = APIRouter(prefix="/holds", tags=["Holds"])
+
+
+@router.post("/", response_model=SeatHold)
+async def hold_seats(
+    data: NewSeatHold,
+    user_id: int = Depends(get_current_user_id),
+    service: HoldService = Depends(get_hold_service),
+):
+    try:
+        return await service.hold(user_id, data)
+    except SeatsUnavailableError as e:
+        raise HTTPException(
+            status_code=409,
+            detail={"message": str(e), "conflicts": e.conflicts},
+        )
+    except DomainError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.post("/{hold_id}/confirm", response_model=list[Booking])
+async def confirm_hold(
+    hold_id: UUID,
+    user_id: int = Depends(get_current_user_id),
+    service: HoldService = Depends(get_hold_service),
+):
+    try:
+        return await service.confirm(hold_id, user_id)
+    except HoldNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except SeatsUnavailableError as e:
+        raise HTTPException(
+            status_code=409,
+            detail={"message": str(e), "conflicts": e.conflicts},
+        )
+    except DomainError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.delete("/{hold_id}", status_code=204)
+async def release_hold(
+    hold_id: UUID,
+    user_id: int = Depends(get_current_user_id),
+    service: HoldService = Depends(get_hold_service),
+):
+    try:
+        await service.release(hold_id, user_id)
+    except HoldNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
@@ -2,9 +2,12 @@ from fastapi import APIRouter, Depends, HTTPException
 
 from core.auth import admin_required
 from domain.exceptions import FilmNotFound, HallNotFound, SessionConflictError, SessionNotFoundError, \
-    SessionHasActiveBookingsError
+    SessionHasActiveBookingsError, InvalidCursorError
 from services.session_service import SessionService, get_session_service
-from schemas.sessions import NewSession, Session
+from schemas.pagination import Page
+from schemas.sessions import NewSession, Session, SeatMap
+from utils.etag import catalog_etag
+from utils.pagination import PageParams, get_page_params
 
 router = APIRouter(tags=["Sessions"])
 
@@ -28,11 +31,33 @@ async def add_session(
     except SessionConflictError as e:
         raise HTTPException(status_code=409, detail=str(e))
 
-@router.get("/sessions/", response_model=list[Session])
+@router.get(
+    "/sessions/",
+    response_model=Page[Session],
+    dependencies=[Depends(catalog_etag("sessions", volatile=True))],
+)
 async def get_all_sessions(
+    film_id: int | None = None,
+    hall_id: int | None = None,
+    page: PageParams = Depends(get_page_params),
     service: SessionService = Depends(get_session_service),
 ):
-    return await service.get_all()
+    try:
+        return await service.get_all(page.limit, page.after, film_id, hall_id)
+
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/sessions/{session_id}/seats", response_model=SeatMap)
+async def get_session_seats(
+    session_id: int,
+    service: SessionService = Depends(get_session_service),
+):
+    try:
+        return await service.get_seat_map(session_id)
+
+    except SessionNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
 
 @router.delete(
     "/sessions/{session_id}",
@@ -1,11 +1,51 @@
+from datetime import datetime
+
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 from database.db import get_session
 from core.auth import get_current_user_id, admin_required
+from domain.exceptions import InvalidCursorError
+from schemas.pagination import Page
+from utils.etag import catalog_etag
+from utils.pagination import PageParams, Timestamptz, get_page_params, keyset_condition, build_page
 
 router = APIRouter(prefix="/views", tags=["Views"])
 
+
+async def _keyset_page(
+    session: AsyncSession,
+    view: str,
+    keys: list[tuple[str, type]],
+    page: PageParams,
+    descending: bool = True,
+    where: str = "TRUE",
+    params: dict | None = None,
+) -> Page[dict]:
+    # Для агрегирующих представлений (vw_top_films, vw_popular_last_week, vw_hall_usage,
+    # vw_films_with_upcoming_sessions) курсор экономит передачу строк, но GROUP BY
+    # по-прежнему считается целиком на каждой странице.
+    try:
+        condition, cursor_params = keyset_condition(keys, page.after, descending)
+    except InvalidCursorError as e:
+        raise HTTPException(400, str(e))
+
+    direction = "DESC" if descending else "ASC"
+    order_by = ", ".join(f"{key} {direction}" for key, _ in keys)
+    query = text(f"""
+        SELECT * FROM {view}
+        WHERE {where} AND {condition}
+        ORDER BY {order_by}
+        LIMIT :limit
+    """)
+    rows = await session.execute(
+        query, {**(params or {}), **cursor_params, "limit": page.limit + 1}
+    )
+    rows, next_cursor = build_page(
+        rows.fetchall(), page.limit, lambda r: tuple(getattr(r, key) for key, _ in keys)
+    )
+    return Page[dict](items=[dict(r._mapping) for r in rows], next_cursor=next_cursor)
+
 @router.get("/user-info")
 async def get_user_info(
     user_id: int = Depends(get_current_user_id),
@@ -25,81 +65,93 @@ async def get_user_info(
         print("Error fetching user info:", e)
         raise HTTPException(500, "Internal server error")
 
-@router.get("/user-history")
+@router.get("/user-history", response_model=Page[dict])
 async def get_user_history(
     user_id: int = Depends(get_current_user_id),
+    page: PageParams = Depends(get_page_params),
     session: AsyncSession = Depends(get_session),
 ):
     try:
-        query = text("""
-            SELECT * FROM vw_user_history
-            WHERE user_id = :user_id
-            ORDER BY start_time DESC
-        """)
-        rows = await session.execute(query, {"user_id": user_id})
-        return [dict(r._mapping) for r in rows.fetchall()]
+        return await _keyset_page(
+            session,
+            "vw_user_history",
+            [("start_time", Timestamptz), ("booking_id", int)],
+            page,
+            where="user_id = :user_id",
+            params={"user_id": user_id},
+        )
+
+    except HTTPException:
+        raise
 
     except Exception as e:
         print("Error fetching user history:", e)
         raise HTTPException(500, "Internal server error")
 
-@router.get("/top-films")
+@router.get("/top-films", response_model=Page[dict], dependencies=[Depends(catalog_etag("films", "sessions", volatile=True))])
 async def get_top_films(
+    page: PageParams = Depends(get_page_params),
     session: AsyncSession = Depends(get_session),
 ):
-    rows = await session.execute(text("SELECT * FROM vw_top_films"))
-    return [dict(r._mapping) for r in rows.fetchall()]
+    return await _keyset_page(session, "vw_top_films", [("total_bookings", int), ("id", int)], page)
 
-@router.get("/top-rated")
+@router.get("/top-rated", response_model=Page[dict], dependencies=[Depends(catalog_etag("films"))])
 async def get_top_rated_films(
+    page: PageParams = Depends(get_page_params),
     session: AsyncSession = Depends(get_session),
 ):
-    rows = await session.execute(text("SELECT * FROM vw_top_rated_films"))
-    return [dict(r._mapping) for r in rows.fetchall()]
+    return await _keyset_page(session, "vw_top_rated_films", [("rating", float), ("id", int)], page)
 
-@router.get("/films/upcoming")
+@router.get("/films/upcoming", response_model=Page[dict], dependencies=[Depends(catalog_etag("films", "sessions", volatile=True))])
 async def get_films_with_upcoming_sessions(
+    page: PageParams = Depends(get_page_params),
     session: AsyncSession = Depends(get_session),
 ):
-    rows = await session.execute(text("SELECT * FROM vw_films_with_upcoming_sessions"))
-    return [dict(r._mapping) for r in rows.fetchall()]
+    return await _keyset_page(
+        session, "vw_films_with_upcoming_sessions", [("next_session", Timestamptz), ("id", int)], page, descending=False
+    )
 
 
-@router.get("/popular-last-week")
+@router.get("/popular-last-week", response_model=Page[dict], dependencies=[Depends(catalog_etag("films", "sessions", volatile=True))])
 async def get_popular_last_week(
+    page: PageParams = Depends(get_page_params),
     session: AsyncSession = Depends(get_session),
 ):
-    rows = await session.execute(text("SELECT * FROM vw_popular_last_week"))
-    return [dict(r._mapping) for r in rows.fetchall()]
+    return await _keyset_page(session, "vw_popular_last_week", [("weekly_bookings", int), ("id", int)], page)
 
-@router.get("/active-bookings", dependencies=[Depends(admin_required)])
+@router.get("/active-bookings", response_model=Page[dict], dependencies=[Depends(admin_required)])
 async def get_active_bookings(
+    page: PageParams = Depends(get_page_params),
     session: AsyncSession = Depends(get_session),
 ):
-    rows = await session.execute(text("SELECT * FROM vw_active_bookings"))
-    return [dict(r._mapping) for r in rows.fetchall()]
+    return await _keyset_page(session, "vw_active_bookings", [("created_at", datetime), ("id", int)], page)
 
-@router.get("/sessions/halls")
+@router.get("/sessions/halls", response_model=Page[dict], dependencies=[Depends(catalog_etag("sessions", "halls", volatile=True))])
 async def get_sessions_with_halls(
+    page: PageParams = Depends(get_page_params),
     session: AsyncSession = Depends(get_session),
 ):
-    rows = await session.execute(text("SELECT * FROM vw_sessions_with_halls"))
-    return [dict(r._mapping) for r in rows.fetchall()]
+    return await _keyset_page(session, "vw_sessions_with_halls", [("start_time", Timestamptz), ("id", int)], page)
 
-@router.get("/upcoming-sessions/{film_id}")
+@router.get("/upcoming-sessions/{film_id}", response_model=Page[dict], dependencies=[Depends(catalog_etag("sessions", volatile=True))])
 async def get_upcoming_sessions_for_film(
     film_id: int,
+    page: PageParams = Depends(get_page_params),
     session: AsyncSession = Depends(get_session)
 ):
     try:
-        query = text("""
-            SELECT *
-            FROM vw_upcoming_sessions
-            WHERE film_id = :film_id
-            ORDER BY start_time
-        """)
-        rows = await session.execute(query, {"film_id": film_id})
-        return [dict(r._mapping) for r in rows.fetchall()]
+        return await _keyset_page(
+            session,
+            "vw_upcoming_sessions",
+            [("start_time", Timestamptz), ("id", int)],
+            page,
+            descending=False,
+            where="film_id = :film_id",
+            params={"film_id": film_id},
+        )
+
+    except HTTPException:
+        raise
 
     except Exception as e:
         print("Error fetching upcoming film sessions:", e)
@@ -150,25 +202,22 @@ async def get_booking_details(
         print("Error fetching booking:", e)
         raise HTTPException(500, "Internal server error")
 
-@router.get("/hall-usage", dependencies=[Depends(admin_required)])
+@router.get("/hall-usage", response_model=Page[dict], dependencies=[Depends(admin_required)])
 async def get_hall_usage(
+    page: PageParams = Depends(get_page_params),
     session: AsyncSession = Depends(get_session),
 ):
-    query = text("""
-        SELECT hall_id, name, capacity, total_sessions
-        FROM vw_hall_usage
-        ORDER BY hall_id
-    """)
-
-    result = await session.execute(query)
-    rows = result.fetchall()
-
-    return [
-        {
-            "id": row.hall_id,
-            "name": row.name,
-            "capacity": row.capacity,
-            "total_sessions": row.total_sessions
-        }
-        for row in rows
-    ]
+    result = await _keyset_page(session, "vw_hall_usage", [("hall_id", int)], page, descending=False)
+
+    return Page[dict](
+        items=[
+            {
+                "id": row["hall_id"],
+                "name": row["name"],
+                "capacity": row["capacity"],
+                "total_sessions": row["total_sessions"]
+            }
+            for row in result.items
+        ],
+        next_cursor=result.next_cursor,
+    )
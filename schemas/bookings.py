@@ -1,6 +1,9 @@
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
 
+# Совпадает с лимитом активных бронирований на пользователя в schema.sql.
+MAX_ACTIVE_BOOKINGS = 5
+
 
 class NewBooking(BaseModel):
     session_id: int
@@ -37,4 +40,21 @@ class BookingDetailed(BaseModel):
     hall_name: str
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class BulkCancelResult(BaseModel):
+    canceled_booking_ids: list[int]
+
+
+class NewBookingBatch(BaseModel):
+    session_id: int
+    seat_numbers: list[int] = Field(..., min_length=1, max_length=MAX_ACTIVE_BOOKINGS)
+
+    @field_validator("seat_numbers")
+    def validate_seats(cls, value):
+        if any(seat <= 0 for seat in value):
+            raise ValueError("Seat numbers must be positive")
+        if len(set(value)) != len(value):
+            raise ValueError("Seat numbers must be unique")
+        return value
\ No newline at end of file
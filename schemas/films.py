@@ -1,6 +1,8 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from enum import Enum
 
+from schemas.sessions import Session
+
 class FilmGenre(str, Enum):
     ACTION = "Боевик"
     COMEDY = "Комедия"
@@ -33,4 +35,40 @@ class Film(BaseModel):
     rating: float
     description: str | None = None
     is_active: bool
-    image_url: str | None = None
\ No newline at end of file
+    image_url: str | None = None
+    image_variants: dict[str, dict[str, str]] | None = None
+
+
+class Poster(BaseModel):
+    image_url: str
+    image_variants: dict[str, dict[str, str]]
+
+
+class FilmFilters(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    genre: tuple[FilmGenre, ...] | None = None
+    is_active: bool | None = None
+    min_rating: float | None = Field(None, ge=0, le=10)
+    max_duration: int | None = Field(None, ge=0)
+
+
+class FilmImportError(BaseModel):
+    row: int
+    error: str
+
+
+class FilmImportResult(BaseModel):
+    inserted: int
+    updated: int
+    rejected: int
+    errors: list[FilmImportError]
+
+
+class FilmPageSession(Session):
+    hall_name: str
+
+
+class FilmPage(BaseModel):
+    film: Film
+    sessions: list[FilmPageSession]
@@ -0,0 +1,18 @@
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from schemas.bookings import NewBookingBatch
+
+
+class NewSeatHold(NewBookingBatch):
+    ttl_seconds: int = Field(120, ge=10, le=900)
+
+
+class SeatHold(BaseModel):
+    hold_id: UUID
+    session_id: int
+    user_id: int
+    seat_numbers: list[int]
+    expires_at: datetime
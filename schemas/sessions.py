@@ -16,6 +16,14 @@ class NewSession(BaseModel):
         return v
 
 
+class SeatMap(BaseModel):
+    session_id: int
+    total_seats: int
+    available_seats: int
+    booked_seats: list[int]
+    held_seats: list[int]
+
+
 class Session(BaseModel):
     id: int
     film_id: int
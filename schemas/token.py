@@ -2,4 +2,9 @@ from pydantic import BaseModel
 
 class Token(BaseModel):
     access_token: str
-    token_type: str = "Bearer"
\ No newline at end of file
+    refresh_token: str | None = None
+    token_type: str = "Bearer"
+
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import BaseModel, EmailStr
 
 
@@ -18,4 +20,8 @@ class User(BaseModel):
     id: int
     name: str
     email: EmailStr
-    role: str
\ No newline at end of file
+    role: str
+
+
+class RoleUpdate(BaseModel):
+    role: Literal["user", "admin"]
@@ -0,0 +1,109 @@
+import asyncio
+from typing import Awaitable, Callable
+
+import asyncpg
+from sqlalchemy.exc import DBAPIError
+
+from core.config import settings
+from database.db import new_session
+from domain.exceptions import DomainError
+from repositories.booking_repository import BookingRepository
+from schemas.bookings import Booking, NewBooking
+
+BatchRequest = tuple[int, NewBooking]
+ApplyBatch = Callable[[int, list[BatchRequest]], Awaitable[list[Booking | DomainError]]]
+
+
+RETRYABLE_ERRORS = (asyncpg.exceptions.DeadlockDetectedError, asyncpg.exceptions.SerializationError)
+
+
+async def apply_batch(session_id: int, requests: list[BatchRequest]) -> list[Booking | DomainError]:
+    """Пачка целиком повторяется при взаимоблокировке или ошибке сериализации."""
+    for attempt in range(settings.booking_queue.max_retries + 1):
+        try:
+            async with new_session() as session:
+                return await BookingRepository(session).create_group(session_id, requests)
+        except DBAPIError as e:
+            cause = getattr(e.orig, "__cause__", None)
+            if not isinstance(cause, RETRYABLE_ERRORS) or attempt == settings.booking_queue.max_retries:
+                raise
+
+
+class BookingQueue:
+    """
+    Очередь бронирований на сеанс с групповой фиксацией.
+
+    Запросы одного сеанса не конкурируют за блокировку строки sessions: их забирает
+    единственный воркер сеанса и применяет пачкой в одной транзакции. Каждый запрос
+    получает через свой future либо Booking, либо собственную доменную ошибку.
+    Воркер завершается, если очередь простаивает idle_seconds.
+    """
+
+    def __init__(self, apply: ApplyBatch, batch_size: int, idle_seconds: float):
+        self.apply = apply
+        self.batch_size = batch_size
+        self.idle_seconds = idle_seconds
+        self._queues: dict[int, asyncio.Queue] = {}
+        self._workers: dict[int, asyncio.Task] = {}
+
+    async def submit(self, user_id: int, data: NewBooking) -> Booking:
+        future = asyncio.get_running_loop().create_future()
+        queue = self._queues.get(data.session_id)
+        if queue is None:
+            queue = self._queues[data.session_id] = asyncio.Queue()
+            self._workers[data.session_id] = asyncio.create_task(
+                self._worker(data.session_id, queue)
+            )
+
+        queue.put_nowait((user_id, data, future))
+        return await future
+
+    async def _worker(self, session_id: int, queue: asyncio.Queue) -> None:
+        while True:
+            try:
+                first = await asyncio.wait_for(queue.get(), timeout=self.idle_seconds)
+            except asyncio.TimeoutError:
+                if queue.empty():
+                    del self._queues[session_id]
+                    del self._workers[session_id]
+                    return
+                continue
+
+            batch = [first]
+            while len(batch) < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+
+            pending = [item for item in batch if not item[2].done()]
+            if not pending:
+                continue
+
+            try:
+                results = await self.apply(
+                    session_id, [(user_id, data) for user_id, data, _ in pending]
+                )
+            except Exception as e:
+                for _, _, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, _, future), result in zip(pending, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    async def close(self) -> None:
+        workers = list(self._workers.values())
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        for queue in self._queues.values():
+            while not queue.empty():
+                _, _, future = queue.get_nowait()
+                if not future.done():
+                    future.set_exception(DomainError("Booking queue is shutting down"))
+        self._queues.clear()
+        self._workers.clear()
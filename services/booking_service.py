@@ -1,25 +1,114 @@
 from fastapi import Depends
 
-from schemas.bookings import NewBooking, Booking, BookingDetailed
+from schemas.bookings import NewBooking, Booking, BookingDetailed, NewBookingBatch, BulkCancelResult
+from schemas.pagination import Page
 from domain.interfaces.booking_repository import IBookingRepository
 from repositories.booking_repository import get_booking_repo, BookingRepository
+from core.config import settings
+from domain.exceptions import DomainError, SeatsUnavailableError
+from services.booking_queue import BookingQueue, apply_batch
+from services.idempotency import idempotency_store
+from services.seat_holds import known_conflicts
+from services.seat_map import seat_maps
+
+booking_queue = BookingQueue(
+    apply_batch,
+    batch_size=settings.booking_queue.batch_size,
+    idle_seconds=settings.booking_queue.idle_seconds,
+)
 
 
 class BookingService:
     def __init__(self, repo: IBookingRepository):
         self.repo = repo
 
-    async def create(self, user_id: int, data: NewBooking) -> Booking:
-        return await self.repo.create(user_id, data)
+    async def create(
+        self, user_id: int, data: NewBooking, idempotency_key: str | None = None
+    ) -> Booking:
+        if idempotency_key is None:
+            return await self._create(user_id, data)
+        return await idempotency_store.run(
+            f"{user_id}:create:{idempotency_key}",
+            data.model_dump_json(),
+            lambda: self._create(user_id, data),
+        )
+
+    async def _create(self, user_id: int, data: NewBooking) -> Booking:
+        conflicts = known_conflicts(data.session_id, [data.seat_number], user_id)
+        if conflicts:
+            raise DomainError(f"Seat {data.seat_number} is held by another user")
+
+        if settings.booking_queue.enabled:
+            booking = await booking_queue.submit(user_id, data)
+        else:
+            booking = await self.repo.create(user_id, data)
+        seat_maps.mark_booked(booking.session_id, [booking.seat_number])
+        return booking
+
+    async def create_many(
+        self, user_id: int, data: NewBookingBatch, idempotency_key: str | None = None
+    ) -> list[Booking]:
+        if idempotency_key is None:
+            return await self._create_many(user_id, data)
+        return await idempotency_store.run(
+            f"{user_id}:create_many:{idempotency_key}",
+            data.model_dump_json(),
+            lambda: self._create_many(user_id, data),
+        )
+
+    async def _create_many(self, user_id: int, data: NewBookingBatch) -> list[Booking]:
+        conflicts = known_conflicts(data.session_id, data.seat_numbers, user_id)
+        if conflicts:
+            raise SeatsUnavailableError(
+                f"Seats are not available for session {data.session_id}", conflicts
+            )
+
+        bookings = await self.repo.create_many(user_id, data)
+        seat_maps.mark_booked(data.session_id, [b.seat_number for b in bookings])
+        return bookings
 
     async def get_my(self, user_id: int) -> list[BookingDetailed]:
         return await self.repo.get_user_bookings(user_id)
 
-    async def cancel(self, booking_id: int, user_id: int) -> Booking:
-        return await self.repo.cancel(booking_id, user_id)
+    async def cancel(
+        self, booking_id: int, user_id: int, idempotency_key: str | None = None
+    ) -> Booking:
+        if idempotency_key is None:
+            return await self._cancel(booking_id, user_id)
+        return await idempotency_store.run(
+            f"{user_id}:cancel:{idempotency_key}",
+            str(booking_id),
+            lambda: self._cancel(booking_id, user_id),
+        )
+
+    async def _cancel(self, booking_id: int, user_id: int) -> Booking:
+        booking = await self.repo.cancel(booking_id, user_id)
+        seat_maps.mark_free(booking.session_id, [booking.seat_number])
+        return booking
+
+    async def cancel_session(self, session_id: int) -> BulkCancelResult:
+        bookings = await self.repo.cancel_session_bookings(session_id)
+        seat_maps.invalidate(session_id)
+        return BulkCancelResult(canceled_booking_ids=[b.id for b in bookings])
+
+    async def cancel_user(self, user_id: int) -> BulkCancelResult:
+        bookings = await self.repo.cancel_user_bookings(user_id)
+        for session_id in {b.session_id for b in bookings}:
+            seat_maps.invalidate(session_id)
+        return BulkCancelResult(canceled_booking_ids=[b.id for b in bookings])
+
+    async def get_all(
+        self,
+        limit: int,
+        after: str | None = None,
+        session_id: int | None = None,
+        user_id: int | None = None,
+        status: str | None = None,
+    ) -> Page[Booking]:
+        return await self.repo.get_all(limit, after, session_id, user_id, status)
 
-    async def get_all(self) -> list[Booking]:
-        return await self.repo.get_all()
+    async def get_by_session(self, session_id: int) -> list[Booking]:
+        return await self.repo.get_session_bookings(session_id)
 
 
 def get_booking_service(
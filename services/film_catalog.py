@@ -0,0 +1,76 @@
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+from core.config import settings
+from database.catalog_versions import catalog_versions
+from database.db import new_session
+from repositories.film_repository import FilmRepository
+from schemas.films import FilmFilters
+from utils.pagination import DEFAULT_LIMIT
+
+
+class FilmCatalogCache:
+    """
+    Read-through кэш каталога фильмов: страницы GET /films/, отдельные фильмы и
+    агрегаты GET /films/{id}/page. В агрегате есть available_seats, поэтому он живёт
+    короткий page_ttl_seconds, а расписание сеансов сбрасывает кэш как и фильмы.
+
+    Любое изменение фильмов сбрасывает кэш целиком — от него зависят порядок и
+    курсоры всех страниц. Свой воркер сбрасывает кэш сразу после коммита в
+    FilmRepository, остальные — по уведомлению catalog_versions. Пока соединение
+    LISTEN недоступно, согласованность держится только на TTL.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[tuple, tuple[Any, float, int]] = OrderedDict()
+        self._generation = 0
+
+    async def get_or_load(
+            self,
+            key: tuple,
+            load: Callable[[], Awaitable[Any]],
+            ttl_seconds: float | None = None,
+    ) -> Any:
+        entry = self._entries.get(key)
+        now = time.monotonic()
+        if entry is not None:
+            value, expires_at, generation = entry
+            if generation == self._generation and now <= expires_at:
+                self._entries.move_to_end(key)
+                return value
+            del self._entries[key]
+
+        generation = self._generation
+        value = await load()
+        # Пока шла загрузка, кэш могли сбросить — тогда результат уже устарел.
+        if value is not None and generation == self._generation:
+            ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+            self._entries[key] = (value, now + ttl, generation)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._entries.clear()
+
+    async def warm(self) -> None:
+        async with new_session() as session:
+            repo = FilmRepository(session)
+            page = await self.get_or_load(
+                ("page", DEFAULT_LIMIT, None, FilmFilters()),
+                lambda: repo.get_all_films(DEFAULT_LIMIT),
+            )
+        for film in page.items:
+            self._entries[("film", film.id)] = (film, time.monotonic() + self.ttl_seconds, self._generation)
+
+
+film_catalog = FilmCatalogCache(
+    max_entries=settings.film_catalog.max_entries,
+    ttl_seconds=settings.film_catalog.ttl_seconds,
+)
+catalog_versions.subscribe("films", film_catalog.invalidate)
+catalog_versions.subscribe("sessions", film_catalog.invalidate)
@@ -0,0 +1,148 @@
+import codecs
+import csv
+import json
+from typing import AsyncIterator
+
+from pydantic import ValidationError
+
+from core.config import settings
+from domain.exceptions import FilmImportFormatError
+from domain.interfaces.film_repository import IFilmRepository
+from schemas.films import FilmImportError, FilmImportResult, NewFilm
+
+FORMATS = ("ndjson", "csv")
+
+
+async def iter_lines(chunks: AsyncIterator[bytes], max_line_bytes: int) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+        if len(buffer) > max_line_bytes:
+            raise FilmImportFormatError(f"Line is longer than {max_line_bytes} bytes")
+    buffer += decoder.decode(b"", final=True)
+    if buffer.strip():
+        yield buffer.rstrip("\r")
+
+
+async def iter_ndjson(lines: AsyncIterator[str]) -> AsyncIterator[tuple[int, dict | str]]:
+    row = 0
+    async for line in lines:
+        if not line.strip():
+            continue
+        row += 1
+        try:
+            value = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield row, f"Invalid JSON: {e.msg}"
+            continue
+        yield row, value if isinstance(value, dict) else "Row must be a JSON object"
+
+
+async def iter_csv(
+        lines: AsyncIterator[str], max_record_bytes: int
+) -> AsyncIterator[tuple[int, dict | str]]:
+    header = None
+    record = ""
+    row = 0
+    async for line in lines:
+        record = f"{record}\n{line}" if record else line
+        # Нечётное число кавычек — поле в кавычках продолжается на следующей строке.
+        if record.count('"') % 2:
+            # Одна лишняя кавычка иначе копит в памяти весь остаток файла.
+            if len(record) > max_record_bytes:
+                raise FilmImportFormatError(f"CSV record is longer than {max_record_bytes} bytes")
+            continue
+        text, record = record, ""
+        if not text.strip():
+            continue
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        row += 1
+        if len(values) != len(header):
+            yield row, f"Expected {len(header)} columns, got {len(values)}"
+            continue
+        yield row, dict(zip(header, values))
+    if record:
+        raise FilmImportFormatError("Unterminated quoted field at end of CSV")
+
+
+class FilmImporter:
+    """
+    Потоковый импорт фильмов: строки валидируются по NewFilm по мере чтения тела,
+    валидные пачками уходят COPY во временную таблицу, проходят проверки add_film
+    (film_error) и вставляются в films одной транзакцией. С upsert фильм с тем же
+    названием обновляется, если такой фильм ровно один. Память ограничена размером пачки, а не размером файла.
+    """
+
+    def __init__(self, repository: IFilmRepository, batch_size: int, max_errors: int, max_line_bytes: int):
+        self.repository = repository
+        self.batch_size = batch_size
+        self.max_errors = max_errors
+        self.max_line_bytes = max_line_bytes
+
+    async def run(self, chunks: AsyncIterator[bytes], fmt: str, upsert: bool = False) -> FilmImportResult:
+        if fmt not in FORMATS:
+            raise FilmImportFormatError(f"Unsupported import format: {fmt}")
+
+        errors: list[FilmImportError] = []
+        rejected = 0
+        batch: list[tuple] = []
+
+        await self.repository.start_import()
+        try:
+            lines = iter_lines(chunks, self.max_line_bytes)
+            if fmt == "ndjson":
+                rows = iter_ndjson(lines)
+            else:
+                rows = iter_csv(lines, self.max_line_bytes)
+            async for row, value in rows:
+                error = value if isinstance(value, str) else None
+                if error is None:
+                    try:
+                        film = NewFilm(**value)
+                    except ValidationError as e:
+                        error = "; ".join(
+                            f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()
+                        )
+                if error is not None:
+                    rejected += 1
+                    if len(errors) < self.max_errors:
+                        errors.append(FilmImportError(row=row, error=error))
+                    continue
+
+                batch.append(
+                    (row, film.title, film.genre.value, film.duration, film.rating, film.description)
+                )
+                if len(batch) >= self.batch_size:
+                    await self.repository.copy_import_rows(batch)
+                    batch = []
+
+            if batch:
+                await self.repository.copy_import_rows(batch)
+            invalid, invalid_errors = await self.repository.reject_import_rows(self.max_errors, upsert)
+            rejected += invalid
+            errors = sorted(
+                errors + [FilmImportError(row=row, error=error) for row, error in invalid_errors],
+                key=lambda e: e.row,
+            )[:self.max_errors]
+            inserted, updated = await self.repository.finish_import(upsert)
+        except BaseException:
+            await self.repository.abort_import()
+            raise
+
+        return FilmImportResult(inserted=inserted, updated=updated, rejected=rejected, errors=errors)
+
+
+def get_film_importer(repository: IFilmRepository) -> FilmImporter:
+    return FilmImporter(
+        repository,
+        batch_size=settings.film_import.batch_size,
+        max_errors=settings.film_import.max_errors,
+        max_line_bytes=settings.film_import.max_line_bytes,
+    )
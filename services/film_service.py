@@ -1,9 +1,20 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import Depends, UploadFile
+from core.config import settings
 from domain.exceptions import FilmNotFound
 from domain.interfaces.film_repository import IFilmRepository
+from domain.interfaces.s3_outbox_repository import IS3OutboxRepository
 from repositories.film_repository import get_film_repo, FilmRepository
-from schemas.films import Film, NewFilm
+from repositories.s3_outbox_repository import get_s3_outbox_repo
+from schemas.films import Film, FilmFilters, FilmImportResult, FilmPage, NewFilm, Poster
+from schemas.pagination import Page
+from services.film_catalog import film_catalog
+from services.film_import import get_film_importer
 from services.image_service import ImageService, get_image_service
+from services.s3_outbox import s3_delete_worker
 
 
 class FilmService:
@@ -11,21 +22,81 @@ class FilmService:
             self,
             repository: IFilmRepository,
             image_service: ImageService,
+            outbox: IS3OutboxRepository,
     ):
         self.repository = repository
         self.image_service = image_service
+        self.outbox = outbox
+
+    async def get_all(
+            self,
+            limit: int,
+            after: str | None = None,
+            filters: FilmFilters = FilmFilters(),
+    ) -> Page[Film]:
+        return await film_catalog.get_or_load(
+            ("page", limit, after, filters),
+            lambda: self.repository.get_all_films(limit, after, filters),
+        )
 
-    async def get_all(self) -> list[Film]:
-        return await self.repository.get_all_films()
+    async def search(self, q: str, limit: int, offset: int) -> list[Film]:
+        return await self.repository.search(q, limit, offset)
 
     async def get_by_id(self, id: int) -> Film:
-        return await self.repository.get_by_id(id)
+        return await film_catalog.get_or_load(
+            ("film", id),
+            lambda: self.repository.get_by_id(id),
+        )
+
+    async def _discard_upload(self, poster: Poster | None) -> None:
+        # Загруженные объекты не попали в БД — удаляем их через outbox.
+        if poster is None:
+            return
+        urls = [poster.image_url]
+        for widths in poster.image_variants.values():
+            urls.extend(widths.values())
+        try:
+            await self.outbox.enqueue([url.split("/")[-1] for url in urls])
+            s3_delete_worker.wake()
+        except Exception as e:
+            print(f"Не удалось поставить {poster.image_url} в очередь на удаление: {e}")
+
+    @asynccontextmanager
+    async def _stored_poster(self, image: UploadFile | None) -> AsyncIterator[Poster | None]:
+        """
+        Сохраняет постер в S3, закрепив его стем в poster_pins. Закрепление
+        коммитится до загрузки и снимается после записи фильма внутри блока: пока оно
+        живо, s3_delete_worker не начинает удалять объекты стема, а уже начатые
+        удаления загрузка дожидается. Ни транзакция, ни блокировки на время
+        обращений к S3 не держатся.
+        """
+        if image is None:
+            yield None
+            return
+        async with self.image_service.prepare(image) as upload:
+            pin_id = await self.outbox.pin(upload.stem, settings.s3_outbox.pin_seconds)
+            try:
+                while await self.outbox.delete_in_flight(upload.stem):
+                    await asyncio.sleep(settings.s3_outbox.pin_wait_seconds)
+                await upload.store()
+                yield upload.poster
+            except Exception:
+                await self._discard_upload(upload.poster)
+                raise
+            finally:
+                try:
+                    await self.outbox.unpin(pin_id)
+                except Exception as e:
+                    # Закрепление истечёт само через pin_seconds.
+                    print(f"Не удалось снять закрепление постера {upload.stem}: {e}")
 
     async def add_film(self, film: NewFilm, image: UploadFile | None = None):
-        image_url = None
-        if image:
-            image_url = await self.image_service.upload(image)
-        return await self.repository.add_film(film, image_url)
+        async with self._stored_poster(image) as poster:
+            return await self.repository.add_film(
+                film,
+                poster.image_url if poster else None,
+                poster.image_variants if poster else None,
+            )
 
     async def delete_film(self, id: int):
         film = await self.repository.get_by_id(id)
@@ -33,14 +104,29 @@ class FilmService:
         if film is None:
             raise FilmNotFound()
 
-        if film.image_url:
-            await self.image_service.delete(image_url=film.image_url)
-
+        # Постер удалит s3_delete_worker: строку в outbox добавляет триггер на films.
         await self.repository.delete(id)
+        if film.image_url:
+            s3_delete_worker.wake()
         return "Film deleted"
 
+    async def import_films(
+            self, chunks: AsyncIterator[bytes], fmt: str, upsert: bool = False
+    ) -> FilmImportResult:
+        return await get_film_importer(self.repository).run(chunks, fmt, upsert)
+
+    async def get_page(self, film_id: int) -> FilmPage:
+        page = await film_catalog.get_or_load(
+            ("film_page", film_id),
+            lambda: self.repository.get_page(film_id),
+            ttl_seconds=settings.film_catalog.page_ttl_seconds,
+        )
+        if page is None:
+            raise FilmNotFound()
+        return page
+
     async def get_sessions(self, film_id: int):
-        film = await self.repository.get_by_id(film_id)
+        film = await self.get_by_id(film_id)
         if film is None:
             raise FilmNotFound()
 
@@ -60,33 +146,41 @@ class FilmService:
             raise FilmNotFound()
 
         image_url = existing_film.image_url
-
-        # ⭐ ЕСЛИ УДАЛЯЕМ ИЗОБРАЖЕНИЕ
-        if remove_image and existing_film.image_url:
-            print(f"Удаляем изображение: {existing_film.image_url}")
-            await self.image_service.delete(image_url=existing_film.image_url)
-            image_url = None
-
-        # Если загружено новое изображение
-        elif image:
-            print(f"Загружаем новое изображение")
-            # Удаляем старое изображение если оно есть
-            if existing_film.image_url:
-                await self.image_service.delete(image_url=existing_film.image_url)
-            # Загружаем новое изображение
-            image_url = await self.image_service.upload(image)
-
-        print(f"Финальный image_url: {image_url}")
-        return await self.repository.update_film(
-            film_id=film_id,
-            film_data=film_data,
-            image_url=image_url,
-            is_active=is_active
-        )
+        image_variants = existing_film.image_variants
+        removing = remove_image and existing_film.image_url
+
+        async with self._stored_poster(None if removing else image) as poster:
+            # ⭐ ЕСЛИ УДАЛЯЕМ ИЗОБРАЖЕНИЕ
+            # Старый постер удалит s3_delete_worker после коммита: строку в outbox
+            # добавляет триггер на films при смене image_url.
+            if removing:
+                print(f"Удаляем изображение: {existing_film.image_url}")
+                image_url = None
+                image_variants = None
+
+            # Если загружено новое изображение
+            elif poster:
+                print(f"Загружаем новое изображение")
+                image_url = poster.image_url
+                image_variants = poster.image_variants
+
+            print(f"Финальный image_url: {image_url}")
+            updated = await self.repository.update_film(
+                film_id=film_id,
+                film_data=film_data,
+                image_url=image_url,
+                is_active=is_active,
+                image_variants=image_variants,
+            )
+
+        if image_url != existing_film.image_url:
+            s3_delete_worker.wake()
+        return updated
 
 
 async def get_film_service(
         repo: FilmRepository = Depends(get_film_repo),
         image_service: ImageService = Depends(get_image_service),
+        outbox: IS3OutboxRepository = Depends(get_s3_outbox_repo),
 ):
-    return FilmService(repo, image_service)
\ No newline at end of file
+    return FilmService(repo, image_service, outbox)
\ No newline at end of file
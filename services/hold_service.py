@@ -0,0 +1,51 @@
+from uuid import UUID
+
+from fastapi import Depends
+
+from domain.exceptions import HoldNotFoundError, SeatsUnavailableError
+from domain.interfaces.hold_repository import IHoldRepository
+from repositories.hold_repository import HoldRepository, get_hold_repo
+from schemas.bookings import Booking
+from schemas.holds import NewSeatHold, SeatHold
+from services.seat_holds import known_conflicts, seat_holds
+from services.seat_map import seat_maps
+
+
+class HoldService:
+    def __init__(self, repo: IHoldRepository):
+        self.repo = repo
+
+    async def hold(self, user_id: int, data: NewSeatHold) -> SeatHold:
+        conflicts = known_conflicts(data.session_id, data.seat_numbers, user_id)
+        if conflicts:
+            raise SeatsUnavailableError(
+                f"Seats are not available for session {data.session_id}", conflicts
+            )
+
+        hold = await self.repo.hold(user_id, data)
+        seat_holds.add(hold)
+        return hold
+
+    async def confirm(self, hold_id: UUID, user_id: int) -> list[Booking]:
+        try:
+            bookings = await self.repo.confirm(hold_id, user_id)
+        except HoldNotFoundError:
+            seat_holds.remove(hold_id)
+            raise
+
+        seat_holds.remove(hold_id)
+        if bookings:
+            seat_maps.mark_booked(bookings[0].session_id, [b.seat_number for b in bookings])
+        return bookings
+
+    async def release(self, hold_id: UUID, user_id: int) -> None:
+        try:
+            await self.repo.release(hold_id, user_id)
+        finally:
+            seat_holds.remove(hold_id)
+
+
+def get_hold_service(
+    repo: HoldRepository = Depends(get_hold_repo),
+) -> HoldService:
+    return HoldService(repo)
@@ -0,0 +1,86 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+from core.config import settings
+from domain.exceptions import DomainError, IdempotencyKeyMismatchError
+
+
+class _Entry:
+    __slots__ = ("fingerprint", "future", "expires_at")
+
+    def __init__(self, fingerprint: str, future: asyncio.Future, expires_at: float):
+        self.fingerprint = fingerprint
+        self.future = future
+        self.expires_at = expires_at
+
+
+class IdempotencyStore:
+    """
+    Ответы на запросы с заголовком Idempotency-Key, ограниченные по числу и времени жизни.
+
+    Первый запрос с ключом выполняет операцию, повторы ждут его future и получают тот же
+    результат или ту же доменную ошибку без обращения к БД. Если первый запрос упал
+    не доменной ошибкой, запись удаляется и следующий повтор выполнит операцию заново.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        stale = []
+        for key, entry in self._entries.items():
+            if entry.expires_at > now and len(self._entries) - len(stale) <= self.max_entries:
+                break
+            # Запрос ещё выполняется: без записи повтор с тем же ключом выполнил бы
+            # операцию второй раз. Она будет вытеснена после завершения.
+            if entry.future.done():
+                stale.append(key)
+        for key in stale:
+            del self._entries[key]
+
+    async def run(self, key: str, fingerprint: str, operation: Callable[[], Awaitable[Any]]) -> Any:
+        while True:
+            self._evict()
+            entry = self._entries.get(key)
+            if entry is None:
+                break
+            if entry.fingerprint != fingerprint:
+                raise IdempotencyKeyMismatchError(
+                    "Idempotency-Key was already used with a different request"
+                )
+            try:
+                return await asyncio.shield(entry.future)
+            except asyncio.CancelledError:
+                if entry.future.cancelled():
+                    continue
+                raise
+
+        future = asyncio.get_running_loop().create_future()
+        entry = _Entry(fingerprint, future, time.monotonic() + self.ttl_seconds)
+        self._entries[key] = entry
+
+        try:
+            result = await operation()
+        except DomainError as e:
+            future.set_exception(e)
+            future.exception()
+            raise
+        except BaseException:
+            if self._entries.get(key) is entry:
+                del self._entries[key]
+            future.cancel()
+            raise
+
+        future.set_result(result)
+        return result
+
+
+idempotency_store = IdempotencyStore(
+    max_entries=settings.idempotency.max_entries,
+    ttl_seconds=settings.idempotency.ttl_seconds,
+)
@@ -1,20 +1,122 @@
-from fastapi import UploadFile, Depends
+import asyncio
+import tempfile
+from concurrent.futures import BrokenExecutor
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, BinaryIO
 
+from fastapi import UploadFile, Depends, HTTPException
+from starlette import status
+
+from core.config import settings
 from domain.interfaces.s3_repository import IS3Repository
 from repositories.s3_repository import get_s3_repo
-from utils.image_utils import validate_image
-import uuid
+from schemas.films import Poster
+from services.poster_renderer import poster_renderer
+from utils.image_utils import spool_image, validate_image
+from utils.image_variants import VARIANT_FORMATS
+
+CONTENT_TYPES = {name: content_type for name, _, content_type in VARIANT_FORMATS}
+EXTENSIONS = {"webp": "webp", "jpeg": "jpg"}
+
+
+class PosterUpload:
+    """
+    Постер, подготовленный к сохранению: ключи — sha256 содержимого, поэтому
+    одинаковые файлы дают одни и те же объекты. store() вызывается после
+    закрепления стема в poster_pins: пока оно живо, s3_delete_worker не удаляет
+    эти объекты.
+    """
+
+    def __init__(
+            self,
+            repo: IS3Repository,
+            spool: BinaryIO,
+            size: int,
+            content_type: str,
+            ext: str,
+            digest: str,
+    ):
+        self.repo = repo
+        self.spool = spool
+        self.size = size
+        self.content_type = content_type
+        self.stem = digest
+        self.key = f"{digest}.{ext}"
+        # Ширина и качество входят в ключ: при смене настроек варианты получают новые URL.
+        self.variant_keys = {
+            (name, width): f"{digest}_{width}q{poster_renderer.quality}.{EXTENSIONS[name]}"
+            for width in poster_renderer.widths
+            for name, _, _ in VARIANT_FORMATS
+        }
+        self.variants: list[tuple[str, int, bytes]] | None = None
+
+        image_variants: dict[str, dict[str, str]] = {}
+        for (name, width), variant_key in self.variant_keys.items():
+            image_variants.setdefault(name, {})[str(width)] = repo.url_for(variant_key)
+        self.poster = Poster(image_url=repo.url_for(self.key), image_variants=image_variants)
+
+    async def stored(self) -> list[bool]:
+        return await asyncio.gather(
+            *(self.repo.exists(k) for k in [self.key, *self.variant_keys.values()])
+        )
+
+    async def render(self) -> None:
+        try:
+            self.variants = await poster_renderer.render(self.spool.name)
+        except BrokenExecutor:
+            raise
+        except Exception:
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail="Invalid Image",
+            )
+
+    async def store(self) -> None:
+        stored = await self.stored()
+        if all(stored):
+            return
+        if self.variants is None:
+            await self.render()
+
+        cache_control = settings.posters.cache_control
+        uploads = []
+        if not stored[0]:
+            self.spool.seek(0)
+            uploads.append(
+                self.repo.upload_fileobj(self.spool, self.key, self.size, self.content_type, cache_control)
+            )
+        missing = {k for k, present in zip(self.variant_keys.values(), stored[1:]) if not present}
+        for name, width, data in self.variants:
+            variant_key = self.variant_keys[(name, width)]
+            if variant_key in missing:
+                uploads.append(self.repo.upload_file(data, variant_key, CONTENT_TYPES[name], cache_control))
+        # Частично загруженные объекты вызывающий код удаляет через outbox,
+        # где poster_key_in_use не даст снести объекты, на которые уже ссылаются.
+        results = await asyncio.gather(*uploads, return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
 
 
 class ImageService:
     def __init__(self, repo: IS3Repository):
         self.repo = repo
 
-    async def upload(self, file: UploadFile):
-        contents = await validate_image(file)
-        ext = file.filename.split(".")[-1]
-        key = f"{uuid.uuid4()}.{ext}"
-        return await self.repo.upload_file(contents, key)
+    @asynccontextmanager
+    async def prepare(self, file: UploadFile) -> AsyncIterator[PosterUpload]:
+        max_bytes = settings.posters.max_bytes
+        content_type, ext = await validate_image(file, max_bytes)
+
+        # Исходник копируется на диск кусками: память не зависит от размера файла,
+        # а пул процессов Pillow читает его по пути.
+        with tempfile.NamedTemporaryFile(suffix=f".{ext}") as spool:
+            size, digest = await spool_image(file, spool, max_bytes, settings.posters.chunk_bytes)
+            upload = PosterUpload(self.repo, spool, size, content_type, ext, digest)
+            # Проверка до закрепления — только подсказка, нужен ли Pillow: решение
+            # о загрузке store() принимает заново после него.
+            if not all(await upload.stored()):
+                await upload.render()
+            yield upload
 
     async def delete(self, image_url: str):
         key = image_url.split("/")[-1]
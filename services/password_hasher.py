@@ -0,0 +1,57 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from core.config import settings
+from core.security import hash_password, verify_password
+from domain.exceptions import PasswordHasherBusyError
+
+
+class PasswordHasher:
+    """
+    bcrypt вне event loop: отдельный пул потоков и ограничение на число ожидающих задач.
+
+    bcrypt отпускает GIL, поэтому потоков достаточно. Если в работе и в очереди уже
+    max_pending вызовов, новый сразу получает PasswordHasherBusyError (429), а не
+    растягивает очередь и время ответа всех остальных эндпоинтов воркера.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._pending = 0
+
+    async def _run(self, func, *args):
+        if self._pending >= self.max_pending:
+            raise PasswordHasherBusyError("Too many concurrent authentication requests")
+        loop = asyncio.get_running_loop()
+        future = self._executor.submit(func, *args)
+        self._pending += 1
+        # Слот освобождается, когда поток действительно закончил: отмена ожидающей
+        # корутины не останавливает уже запущенный bcrypt.
+        future.add_done_callback(lambda _: self._release(loop))
+        return await asyncio.wrap_future(future)
+
+    def _release(self, loop: asyncio.AbstractEventLoop) -> None:
+        try:
+            loop.call_soon_threadsafe(self._decrement)
+        except RuntimeError:
+            # Цикл уже закрыт — счётчик больше никто не читает.
+            pass
+
+    def _decrement(self) -> None:
+        self._pending -= 1
+
+    async def hash(self, password: str) -> bytes:
+        return await self._run(hash_password, password)
+
+    async def verify(self, password: str, hashed_password: bytes) -> bool:
+        return await self._run(verify_password, password, hashed_password)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(
+    workers=settings.password_hashing.workers,
+    max_pending=settings.password_hashing.max_pending,
+)
@@ -0,0 +1,40 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from core.config import settings
+from utils.image_variants import render_variants
+
+
+class PosterRenderer:
+    """
+    Пул процессов для Pillow: ресайз и кодирование постеров не занимают event loop
+    и не упираются в GIL. Процессы стартуют через spawn при первой загрузке.
+    """
+
+    def __init__(self, workers: int, widths: tuple[int, ...], quality: int):
+        self.workers = workers
+        self.widths = widths
+        self.quality = quality
+        self._executor: ProcessPoolExecutor | None = None
+
+    async def render(self, path: str) -> list[tuple[str, int, bytes]]:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, render_variants, path, self.widths, self.quality
+        )
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+poster_renderer = PosterRenderer(
+    workers=settings.posters.workers,
+    widths=tuple(settings.posters.widths),
+    quality=settings.posters.quality,
+)
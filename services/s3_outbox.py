@@ -0,0 +1,104 @@
+import asyncio
+
+from core.config import settings
+from database.db import new_session
+from repositories.s3_outbox_repository import S3OutboxRepository
+from repositories.s3_repository import get_s3_repo
+
+
+class S3DeleteWorker:
+    """
+    Фоновый воркер, удаляющий объекты S3 из s3_delete_outbox после коммита.
+
+    Строки забираются через FOR UPDATE SKIP LOCKED, поэтому воркеры разных процессов
+    не удаляют один объект дважды. Ошибка S3 не теряет строку: она откладывается с
+    экспоненциальной задержкой. wake() будит воркер сразу после записи в БД, иначе
+    он проверяет очередь раз в poll_seconds. claim коммитится до обращения к S3:
+    забранные строки помечены claimed_until, и на время удаления ни транзакция, ни
+    блокировки не держатся.
+    """
+
+    def __init__(
+            self,
+            batch_size: int,
+            poll_seconds: float,
+            base_backoff_seconds: float,
+            max_backoff_seconds: float,
+            claim_seconds: float,
+    ):
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self.base_backoff_seconds = base_backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.claim_seconds = claim_seconds
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def wake(self) -> None:
+        self._wakeup.set()
+
+    def _backoff(self, attempts: int) -> float:
+        return min(self.base_backoff_seconds * 2 ** attempts, self.max_backoff_seconds)
+
+    async def run_once(self) -> int:
+        s3 = get_s3_repo()
+        async with new_session() as session:
+            repo = S3OutboxRepository(session)
+            jobs = await repo.claim(self.batch_size, self.claim_seconds)
+            await session.commit()
+            if not jobs:
+                return 0
+
+            results = await asyncio.gather(
+                *(s3.delete(key) for _, key, _ in jobs), return_exceptions=True
+            )
+            done = []
+            for (job_id, key, attempts), result in zip(jobs, results):
+                if isinstance(result, BaseException):
+                    await repo.retry_later(job_id, repr(result), self._backoff(attempts))
+                else:
+                    done.append(job_id)
+            if done:
+                await repo.complete(done)
+            await session.commit()
+            return len(jobs)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                processed = await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"s3_delete_outbox: {e}")
+                processed = 0
+
+            if processed >= self.batch_size:
+                continue
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+s3_delete_worker = S3DeleteWorker(
+    batch_size=settings.s3_outbox.batch_size,
+    poll_seconds=settings.s3_outbox.poll_seconds,
+    base_backoff_seconds=settings.s3_outbox.base_backoff_seconds,
+    max_backoff_seconds=settings.s3_outbox.max_backoff_seconds,
+    claim_seconds=settings.s3_outbox.claim_seconds,
+)
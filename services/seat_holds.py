@@ -0,0 +1,101 @@
+import heapq
+import time
+from collections import OrderedDict
+from uuid import UUID
+
+from core.config import settings
+from schemas.holds import SeatHold
+
+
+class SeatHoldRegistry:
+    """
+    Удержания мест, известные этому процессу.
+
+    Источник истины — таблица seat_holds; реестр нужен, чтобы отклонять заведомо
+    конфликтующие запросы без обращения к БД и показывать удержания в карте мест.
+    Истёкшие удержания вычищаются по min-куче сроков при каждом обращении.
+
+    Удержание могут снять или подтвердить в другом процессе, поэтому holder()
+    доверяет реестру сеанса, только пока его снимок из БД моложе ttl_seconds.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._holds: dict[UUID, SeatHold] = {}
+        self._seats: dict[int, dict[int, UUID]] = {}
+        self._expiry: list[tuple[float, UUID]] = []
+        self._refreshed_at: OrderedDict[int, float] = OrderedDict()
+
+    def sweep(self) -> None:
+        stale = time.monotonic() - self.ttl_seconds
+        while self._refreshed_at and next(iter(self._refreshed_at.values())) < stale:
+            self._refreshed_at.popitem(last=False)
+
+        now = time.time()
+        while self._expiry and self._expiry[0][0] <= now:
+            expires_at, hold_id = heapq.heappop(self._expiry)
+            hold = self._holds.get(hold_id)
+            if hold is not None and hold.expires_at.timestamp() == expires_at:
+                self._drop(hold)
+
+    def add(self, hold: SeatHold) -> None:
+        self._holds[hold.hold_id] = hold
+        seats = self._seats.setdefault(hold.session_id, {})
+        for seat in hold.seat_numbers:
+            seats[seat] = hold.hold_id
+        heapq.heappush(self._expiry, (hold.expires_at.timestamp(), hold.hold_id))
+
+    def remove(self, hold_id: UUID) -> SeatHold | None:
+        hold = self._holds.get(hold_id)
+        if hold is not None:
+            self._drop(hold)
+        return hold
+
+    def replace_session(self, session_id: int, holds: list[SeatHold]) -> None:
+        for hold_id in set(self._seats.get(session_id, {}).values()):
+            self._drop(self._holds[hold_id])
+        for hold in holds:
+            self.add(hold)
+        self._refreshed_at[session_id] = time.monotonic()
+        self._refreshed_at.move_to_end(session_id)
+
+    def holder(self, session_id: int, seat: int) -> int | None:
+        self.sweep()
+        if session_id not in self._refreshed_at:
+            return None
+        hold_id = self._seats.get(session_id, {}).get(seat)
+        return self._holds[hold_id].user_id if hold_id is not None else None
+
+    def held_seats(self, session_id: int) -> list[int]:
+        self.sweep()
+        return sorted(self._seats.get(session_id, {}))
+
+    def _drop(self, hold: SeatHold) -> None:
+        self._holds.pop(hold.hold_id, None)
+        seats = self._seats.get(hold.session_id)
+        if seats is None:
+            return
+        for seat in hold.seat_numbers:
+            if seats.get(seat) == hold.hold_id:
+                del seats[seat]
+        if not seats:
+            del self._seats[hold.session_id]
+
+
+seat_holds = SeatHoldRegistry(ttl_seconds=settings.seat_map.ttl_seconds)
+
+
+def known_conflicts(session_id: int, seats: list[int], user_id: int) -> list[dict]:
+    """
+    Конфликты с удержаниями, которые видны без запроса в БД.
+
+    Карта мест сюда не входит: место могли освободить в другом воркере, а её снимок
+    живёт до seat_map.ttl_seconds. Занятость проверяют add_booking/hold_seats под
+    блокировкой сеанса.
+    """
+    conflicts = []
+    for seat in sorted(seats):
+        holder = seat_holds.holder(session_id, seat)
+        if holder is not None and holder != user_id:
+            conflicts.append({"seat_number": seat, "reason": "held"})
+    return conflicts
@@ -0,0 +1,138 @@
+import time
+from collections import OrderedDict
+
+from core.config import settings
+
+
+class SeatBitmap:
+    """Битовая карта мест сеанса: бит N-1 установлен, если место N занято."""
+
+    __slots__ = ("total_seats", "bits", "booked", "loaded_at")
+
+    def __init__(self, total_seats: int, booked_seats: list[int]):
+        self.total_seats = total_seats
+        self.bits = bytearray((total_seats + 7) // 8)
+        self.booked = 0
+        self.loaded_at = time.monotonic()
+        for seat in booked_seats:
+            self.set(seat)
+
+    def _position(self, seat: int) -> tuple[int, int] | None:
+        if seat <= 0 or seat > self.total_seats:
+            return None
+        index, offset = divmod(seat - 1, 8)
+        return index, 1 << offset
+
+    def is_booked(self, seat: int) -> bool:
+        position = self._position(seat)
+        if position is None:
+            return False
+        index, mask = position
+        return bool(self.bits[index] & mask)
+
+    def set(self, seat: int) -> None:
+        position = self._position(seat)
+        if position is None:
+            return
+        index, mask = position
+        if not self.bits[index] & mask:
+            self.bits[index] |= mask
+            self.booked += 1
+
+    def clear(self, seat: int) -> None:
+        position = self._position(seat)
+        if position is None:
+            return
+        index, mask = position
+        if self.bits[index] & mask:
+            self.bits[index] &= ~mask
+            self.booked -= 1
+
+    def booked_seats(self) -> list[int]:
+        seats = []
+        for index, byte in enumerate(self.bits):
+            if not byte:
+                continue
+            for offset in range(8):
+                if byte & (1 << offset):
+                    seats.append(index * 8 + offset + 1)
+        return seats
+
+    @property
+    def available(self) -> int:
+        return self.total_seats - self.booked
+
+
+class SeatMapRegistry:
+    """
+    LRU-реестр битовых карт по сеансам с ограниченным временем жизни.
+
+    Каждый mark_*/invalidate сдвигает поколение сеанса, даже если карты ещё нет:
+    put с поколением, снятым до загрузки, не кладёт карту, если её успели изменить.
+    Поколения — метки общего счётчика; вытесненные из LRU заменяются максимальной
+    вытесненной меткой, поэтому сдвиг не теряется и при вытеснении.
+    """
+
+    def __init__(self, max_sessions: int, ttl_seconds: float):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._maps: OrderedDict[int, SeatBitmap] = OrderedDict()
+        self._generations: OrderedDict[int, int] = OrderedDict()
+        self._clock = 0
+        self._evicted = 0
+
+    def generation(self, session_id: int) -> int:
+        return self._generations.get(session_id, self._evicted)
+
+    def _bump(self, session_id: int) -> None:
+        self._clock += 1
+        self._generations[session_id] = self._clock
+        self._generations.move_to_end(session_id)
+        while len(self._generations) > self.max_sessions:
+            _, stamp = self._generations.popitem(last=False)
+            self._evicted = max(self._evicted, stamp)
+
+    def get(self, session_id: int) -> SeatBitmap | None:
+        bitmap = self._maps.get(session_id)
+        if bitmap is None:
+            return None
+        if time.monotonic() - bitmap.loaded_at > self.ttl_seconds:
+            del self._maps[session_id]
+            return None
+        self._maps.move_to_end(session_id)
+        return bitmap
+
+    def put(self, session_id: int, bitmap: SeatBitmap, generation: int | None = None) -> bool:
+        if generation is not None and generation != self.generation(session_id):
+            return False
+        self._maps[session_id] = bitmap
+        self._maps.move_to_end(session_id)
+        while len(self._maps) > self.max_sessions:
+            self._maps.popitem(last=False)
+        return True
+
+    def mark_booked(self, session_id: int, seats: list[int]) -> None:
+        self._bump(session_id)
+        bitmap = self._maps.get(session_id)
+        if bitmap is None:
+            return
+        for seat in seats:
+            bitmap.set(seat)
+
+    def mark_free(self, session_id: int, seats: list[int]) -> None:
+        self._bump(session_id)
+        bitmap = self._maps.get(session_id)
+        if bitmap is None:
+            return
+        for seat in seats:
+            bitmap.clear(seat)
+
+    def invalidate(self, session_id: int) -> None:
+        self._bump(session_id)
+        self._maps.pop(session_id, None)
+
+
+seat_maps = SeatMapRegistry(
+    max_sessions=settings.seat_map.max_sessions,
+    ttl_seconds=settings.seat_map.ttl_seconds,
+)
@@ -3,7 +3,10 @@ from fastapi import Depends
 from domain.exceptions import SessionNotFoundError, SessionHasActiveBookingsError, SessionConflictError
 from domain.interfaces.session_repository import ISessionRepository
 from repositories.session_repository import SessionRepository, get_session_repository
-from schemas.sessions import NewSession, Session
+from schemas.pagination import Page
+from schemas.sessions import NewSession, Session, SeatMap
+from services.seat_holds import seat_holds
+from services.seat_map import SeatBitmap, seat_maps
 
 
 class SessionService:
@@ -13,12 +16,43 @@ class SessionService:
     async def add(self, data: NewSession) -> Session:
         return await self.repository.add_session(data)
 
-    async def get_all(self) -> list[Session]:
-        return await self.repository.get_all_sessions()
+    async def get_all(
+            self,
+            limit: int,
+            after: str | None = None,
+            film_id: int | None = None,
+            hall_id: int | None = None,
+    ) -> Page[Session]:
+        return await self.repository.get_all_sessions(limit, after, film_id, hall_id)
+
+    async def get_seat_map(self, session_id: int) -> SeatMap:
+        bitmap = seat_maps.get(session_id)
+        if bitmap is None:
+            generation = seat_maps.generation(session_id)
+            state = await self.repository.get_seat_state(session_id)
+            if state is None:
+                raise SessionNotFoundError(f"Session {session_id} not found")
+            total_seats, booked_seats = state
+            bitmap = SeatBitmap(total_seats, booked_seats)
+            # Бронирование или отмена во время загрузки — снимок уже устарел, не кэшируем.
+            seat_maps.put(session_id, bitmap, generation)
+            seat_holds.replace_session(
+                session_id, await self.repository.get_session_holds(session_id)
+            )
+
+        held_seats = [seat for seat in seat_holds.held_seats(session_id) if not bitmap.is_booked(seat)]
+        return SeatMap(
+            session_id=session_id,
+            total_seats=bitmap.total_seats,
+            available_seats=bitmap.available - len(held_seats),
+            booked_seats=bitmap.booked_seats(),
+            held_seats=held_seats,
+        )
 
     async def delete(self, session_id: int) -> None:
         try:
-            return await self.repository.delete_session(session_id)
+            await self.repository.delete_session(session_id)
+            seat_maps.invalidate(session_id)
         except (SessionNotFoundError, SessionHasActiveBookingsError, SessionConflictError) as e:
             raise e
         except Exception as e:
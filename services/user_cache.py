@@ -0,0 +1,51 @@
+import time
+from collections import OrderedDict
+
+from core.config import settings
+from database.catalog_versions import catalog_versions
+from schemas.users import User
+
+
+class UserCache:
+    """
+    TTL-кэш строк users по id для get_current_user и admin_required.
+
+    Смена роли увеличивает версию users в catalog_versions: свой воркер сбрасывает
+    кэш сразу после коммита, остальные — по уведомлению. Пока соединение LISTEN
+    недоступно, устаревшая роль живёт не дольше ttl_seconds.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[int, tuple[User, float]] = OrderedDict()
+
+    def get(self, user_id: int) -> User | None:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        user, loaded_at = entry
+        if time.monotonic() - loaded_at > self.ttl_seconds:
+            del self._entries[user_id]
+            return None
+        self._entries.move_to_end(user_id)
+        return user
+
+    def put(self, user: User) -> None:
+        self._entries[user.id] = (user, time.monotonic())
+        self._entries.move_to_end(user.id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+user_cache = UserCache(
+    max_entries=settings.user_cache.max_entries,
+    ttl_seconds=settings.user_cache.ttl_seconds,
+)
+catalog_versions.subscribe("users", user_cache.clear)
@@ -1,20 +1,63 @@
+from datetime import datetime, timedelta, timezone
+from uuid import UUID, uuid4
+
 from fastapi.params import Depends
 from pydantic import EmailStr
 
-from core.security import hash_password, create_jwt, verify_password
+from core.security import create_jwt, decode_jwt, password_needs_rehash
 from core.config import settings
-from domain.exceptions import InvalidCredentialsError
+from domain.exceptions import InvalidCredentialsError, InvalidRefreshTokenError, PasswordHasherBusyError, \
+    UserNotFoundError
+from domain.interfaces.refresh_token_repository import IRefreshTokenRepository
+from repositories.refresh_token_repository import get_refresh_token_repo
 from repositories.user_repository import UserRepository, get_user_repo
 from schemas.token import Token
-from schemas.users import UserRegistration
+from schemas.users import User, UserRegistration
+from services.password_hasher import password_hasher
+from services.user_cache import user_cache
+
+
+def _refresh_expires_at() -> datetime:
+    return datetime.now(timezone.utc) + timedelta(days=settings.auth_jwt.refresh_token_expire_days)
+
+
+def _refresh_jti(refresh_token: str) -> UUID:
+    try:
+        payload = decode_jwt(refresh_token)
+        if payload.get("type") != "refresh":
+            raise ValueError("not a refresh token")
+        return UUID(payload["jti"])
+    except Exception:
+        raise InvalidRefreshTokenError("Invalid or expired refresh token")
 
 
 class UserService:
-    def __init__(self, repository: UserRepository):
+    def __init__(self, repository: UserRepository, tokens: IRefreshTokenRepository):
         self.repository = repository
+        self.tokens = tokens
+
+    def _make_tokens(self, user: User, jti: UUID) -> Token:
+        access_token = create_jwt(
+            token_type="access",
+            token_data=str(user.id),
+            expire_minutes=settings.auth_jwt.access_token_expire,
+            role=user.role,
+        )
+        refresh_token = create_jwt(
+            token_type="refresh",
+            token_data=str(user.id),
+            expire_minutes=settings.auth_jwt.refresh_token_expire_days * 24 * 60,
+            jti=str(jti),
+        )
+        return Token(access_token=access_token, refresh_token=refresh_token)
+
+    async def _start_token_family(self, user: User) -> Token:
+        jti = uuid4()
+        await self.tokens.issue(jti, uuid4(), user.id, _refresh_expires_at())
+        return self._make_tokens(user, jti)
 
     async def registration(self, userdata: UserRegistration) -> Token:
-        hashed_password = hash_password(userdata.password)
+        hashed_password = await password_hasher.hash(userdata.password)
 
         user = await self.repository.create_user(
             name=userdata.name,
@@ -22,31 +65,50 @@ class UserService:
             password_hash=hashed_password,
         )
 
-        access_token = create_jwt(
-            token_type="access",
-            token_data=str(user.id),
-            expire_minutes=settings.auth_jwt.access_token_expire,
-        )
-        return Token(access_token=access_token)
+        return await self._start_token_family(user)
 
     async def login(self, email: EmailStr, password: str) -> Token:
         user = await self.repository.get_by_email(email)
         if not user:
             raise InvalidCredentialsError
 
-        if not verify_password(password, user.password_hash):
+        if not await password_hasher.verify(password, user.password_hash):
             raise InvalidCredentialsError
 
-        access_token = create_jwt(
-            token_type="access",
-            token_data=str(user.id),
-            expire_minutes=settings.auth_jwt.access_token_expire,
-        )
+        if password_needs_rehash(user.password_hash):
+            try:
+                password_hash = await password_hasher.hash(password)
+            except PasswordHasherBusyError:
+                # Пароль уже проверен — перехешируем при следующем входе.
+                pass
+            else:
+                await self.repository.update_password_hash(user.id, password_hash)
+
+        return await self._start_token_family(User(**user.model_dump(exclude={"password_hash"})))
+
+    async def refresh(self, refresh_token: str) -> Token:
+        jti = _refresh_jti(refresh_token)
+        new_jti = uuid4()
+        user = await self.tokens.rotate(jti, new_jti, _refresh_expires_at())
+        if user is None:
+            raise InvalidRefreshTokenError("Refresh token was revoked or already used")
+        return self._make_tokens(user, new_jti)
+
+    async def logout(self, refresh_token: str) -> None:
+        await self.tokens.revoke_family(_refresh_jti(refresh_token))
 
-        return Token(access_token=access_token)
+    async def set_role(self, user_id: int, role: str) -> User:
+        user = await self.repository.set_role(user_id, role)
+        if user is None:
+            raise UserNotFoundError("User not found")
+        user_cache.invalidate(user_id)
+        # Токены со старой ролью больше не продлеваются: нужен новый вход.
+        await self.tokens.revoke_user(user_id)
+        return user
 
 
 async def get_user_service(
     repo: UserRepository = Depends(get_user_repo),
+    tokens: IRefreshTokenRepository = Depends(get_refresh_token_repo),
 ) -> UserService:
-    return UserService(repo)
+    return UserService(repo, tokens)
@@ -0,0 +1,29 @@
+from typing import Callable
+
+from fastapi import HTTPException, Request, Response
+
+from database.catalog_versions import catalog_versions
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def catalog_etag(*names: str, volatile: bool = False) -> Callable:
+    """
+    Зависимость для GET-списков каталога: ставит ETag из версий names и отвечает 304
+    на совпавший If-None-Match до открытия сессии БД и сериализации ответа.
+    """
+
+    def dependency(request: Request, response: Response) -> None:
+        etag = catalog_versions.etag(names, volatile)
+        if etag is None:
+            return
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _matches(if_none_match, etag):
+            raise HTTPException(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+
+    return dependency
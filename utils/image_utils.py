@@ -1,28 +1,67 @@
-import io
-from PIL import Image
+import hashlib
+from typing import BinaryIO
+
 from fastapi import UploadFile, HTTPException
 from starlette import status
 
 
-ALLOWED_MIME = {"image/png", "image/jpeg"}
+# Тип определяется по сигнатуре файла, а не по заявленному клиентом content_type.
+SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", "image/png", "png"),
+    (b"\xff\xd8\xff", "image/jpeg", "jpg"),
+)
+HEADER_BYTES = max(len(magic) for magic, _, _ in SIGNATURES)
+
+
+def sniff_image_type(header: bytes) -> tuple[str, str] | None:
+    for magic, content_type, ext in SIGNATURES:
+        if header.startswith(magic):
+            return content_type, ext
+    return None
+
 
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Image is larger than {max_bytes} bytes",
+    )
 
-async def validate_image(file: UploadFile) -> bytes:
-    contents = await file.read()
 
-    if file.content_type not in ALLOWED_MIME:
+async def validate_image(file: UploadFile, max_bytes: int) -> tuple[str, str]:
+    """
+    Проверяет размер и сигнатуру загрузки, не читая файл целиком.
+    Возвращает (content_type, расширение).
+    """
+    if file.size is not None and file.size > max_bytes:
+        raise _too_large(max_bytes)
+
+    header = await file.read(HEADER_BYTES)
+    await file.seek(0)
+    detected = sniff_image_type(header)
+    if detected is None:
         raise HTTPException(
             status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
             detail="Unsupported image type",
         )
+    return detected
 
-    try:
-        img = Image.open(io.BytesIO(contents))
-        img.verify()
-    except Exception:
-        raise HTTPException(
-            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
-            detail="Invalid Image",
-        )
 
-    return contents
+async def spool_image(
+        file: UploadFile, target: BinaryIO, max_bytes: int, chunk_bytes: int
+) -> tuple[int, str]:
+    """
+    Копирует загрузку в target кусками по chunk_bytes и прерывается, как только
+    превышен max_bytes. В памяти одновременно не больше одного куска.
+    Возвращает (размер, sha256 содержимого).
+    """
+    size = 0
+    digest = hashlib.sha256()
+    while chunk := await file.read(chunk_bytes):
+        size += len(chunk)
+        if size > max_bytes:
+            raise _too_large(max_bytes)
+        digest.update(chunk)
+        target.write(chunk)
+    target.flush()
+    target.seek(0)
+    return size, digest.hexdigest()
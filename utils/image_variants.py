@@ -0,0 +1,35 @@
+import io
+
+from PIL import Image, ImageOps
+
+VARIANT_FORMATS = (("webp", "WEBP", "image/webp"), ("jpeg", "JPEG", "image/jpeg"))
+
+
+def render_variants(path: str, widths: tuple[int, ...], quality: int) -> list[tuple[str, int, bytes]]:
+    """
+    Уменьшенные копии постера фиксированной ширины в WebP и JPEG: [(формат, ширина, байты)].
+
+    Выполняется в пуле процессов, поэтому модуль не тянет за собой приложение.
+    Исходник читается с диска по path, а не передаётся в процесс целиком.
+    Картинки уже нужной ширины не увеличиваются.
+    """
+    with Image.open(path) as source:
+        source.verify()
+
+    variants = []
+    with Image.open(path) as source:
+        # JPEG декодируется сразу в уменьшенном масштабе, если это возможно.
+        source.draft("RGB", (max(widths), 1))
+        image = ImageOps.exif_transpose(source).convert("RGB")
+
+    for width in sorted(widths, reverse=True):
+        if width < image.width:
+            height = max(1, round(image.height * width / image.width))
+            resized = image.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=3.0)
+        else:
+            resized = image
+        for name, pil_format, _ in VARIANT_FORMATS:
+            buffer = io.BytesIO()
+            resized.save(buffer, pil_format, quality=quality)
+            variants.append((name, width, buffer.getvalue()))
+    return variants
@@ -0,0 +1,110 @@
+import base64
+import binascii
+import json
+import math
+from datetime import datetime
+from typing import Any, Callable
+
+from fastapi import Query
+from pydantic import BaseModel
+
+from domain.exceptions import InvalidCursorError
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+INT_MIN, INT_MAX = -2 ** 31, 2 ** 31 - 1
+
+
+class Timestamptz(datetime):
+    """Тип ключа курсора для колонок TIMESTAMPTZ; datetime — для колонок TIMESTAMP."""
+
+
+class PageParams(BaseModel):
+    limit: int = DEFAULT_LIMIT
+    after: str | None = None
+
+
+def get_page_params(
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    after: str | None = Query(None, description="Курсор из next_cursor предыдущей страницы"),
+) -> PageParams:
+    return PageParams(limit=limit, after=after)
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any, expected: type) -> Any:
+    """Значение курсора должно иметь тип ключа, иначе оно дойдёт до asyncpg и упадёт там."""
+    if expected in (datetime, Timestamptz):
+        if isinstance(value, dict) and set(value) == {"dt"} and isinstance(value["dt"], str):
+            # Смещение должно совпадать с типом колонки: aware-значение в TIMESTAMP
+            # asyncpg не примет, а naive в TIMESTAMPTZ сравнится не с тем моментом.
+            decoded = datetime.fromisoformat(value["dt"])
+            if (decoded.tzinfo is not None) == (expected is Timestamptz):
+                return decoded
+    elif expected is int:
+        if type(value) is int and INT_MIN <= value <= INT_MAX:
+            return value
+    elif expected is float:
+        if type(value) in (int, float) and math.isfinite(value):
+            return float(value)
+    elif expected is str:
+        if isinstance(value, str) and "\x00" not in value:
+            return value
+    raise InvalidCursorError("Invalid cursor")
+
+
+def encode_cursor(*values: Any) -> str:
+    payload = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, types: list[type]) -> list[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, ValueError):
+        raise InvalidCursorError("Invalid cursor")
+
+    if not isinstance(values, list) or len(values) != len(types):
+        raise InvalidCursorError("Invalid cursor")
+
+    try:
+        return [_decode_value(v, t) for v, t in zip(values, types)]
+    except ValueError:
+        raise InvalidCursorError("Invalid cursor")
+
+
+def keyset_condition(
+    keys: list[tuple[str, type]],
+    after: str | None,
+    descending: bool = True,
+) -> tuple[str, dict]:
+    """
+    Условие "строго после курсора" для сортировки по keys — парам (колонка, тип
+    значения: int, float, str, datetime или Timestamptz) — в одном направлении. На таблицах
+    сравнение кортежей (a, b) < (:a, :b) Postgres выполняет по составному индексу;
+    на агрегирующих представлениях агрегат всё равно пересчитывается целиком.
+    """
+    if after is None:
+        return "TRUE", {}
+
+    columns = [column for column, _ in keys]
+    values = decode_cursor(after, [expected for _, expected in keys])
+    names = [f"after_{i}" for i in range(len(columns))]
+    operator = "<" if descending else ">"
+    condition = f"({', '.join(columns)}) {operator} ({', '.join(':' + n for n in names)})"
+    return condition, dict(zip(names, values))
+
+
+def build_page(rows: list, limit: int, key: Callable[[Any], tuple]) -> tuple[list, str | None]:
+    """Отрезает лишнюю (limit + 1)-ю строку и строит курсор по последней строке страницы."""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(*key(rows[-1]))